@@ -0,0 +1,69 @@
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import AddonFile, iso_8601_to_datetime  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def strptime_to_datetime(date: str) -> datetime:
+    # The original strptime-based parser, kept as the reference to compare against
+    try:
+        return datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%fZ')
+    except ValueError:
+        return datetime.strptime(date, '%Y-%m-%dT%H:%M:%SZ')
+
+
+def file_payload(n: int):
+    with open(os.path.join(FIXTURES, 'addon.json')) as f:
+        template = json.load(f)['latestFiles'][0]
+    files = []
+    for i in range(n):
+        j = dict(template, id=i)
+        # Upload dates are mostly unique, half of them with second precision; release dates repeat per version
+        j['fileDate'] = f'20{15 + i % 7}-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{i * 7 % 60:02d}' + \
+            ('Z' if i % 2 else f'.{i % 1000}Z')
+        j['gameVersionDateReleased'] = f'2021-01-{1 + i % 20:02d}T14:14:48.91Z'
+        files.append(j)
+    return files
+
+
+def bench(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def run(n: int = 10000) -> dict:
+    files = file_payload(n)
+    dates = [d for j in files for d in (j['fileDate'], j['gameVersionDateReleased'])]
+    assert all(iso_8601_to_datetime(d) == strptime_to_datetime(d) for d in dates)
+
+    def cold():
+        iso_8601_to_datetime.cache_clear()
+        return [iso_8601_to_datetime(d) for d in dates]
+    return {
+        'files': n,
+        'timestamps': len(dates),
+        'strptime_ms': bench(lambda: [strptime_to_datetime(d) for d in dates], 3) * 1000,
+        'cold_ms': bench(cold, 3) * 1000,
+        'warm_ms': bench(lambda: [iso_8601_to_datetime(d) for d in dates], 3) * 1000,
+        'addon_files_ms': bench(lambda: [AddonFile(j) for j in files], 3) * 1000,
+    }
+
+
+def main(n: int = 10000):
+    r = run(n)
+    print(f'{r["timestamps"]} timestamps from {n} files')
+    print(f'strptime: {r["strptime_ms"]:.2f} ms')
+    print(f'fast parser, cold memo: {r["cold_ms"]:.2f} ms')
+    print(f'fast parser, warm memo: {r["warm_ms"]:.2f} ms')
+    print(f'speedup (cold): {r["strptime_ms"] / r["cold_ms"]:.1f}x')
+    print(f'{n} AddonFile models: {r["addon_files_ms"]:.2f} ms')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,80 @@
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import Addon, _Model  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURES, name + '.json')) as f:
+        return json.load(f)
+
+
+class DictModel:
+    # Reference for the layout models had before __slots__: fields in a per-instance __dict__, collections as lists
+
+    def __init__(self, model: _Model):
+        self._cf = model._cf
+        self._serialise = model._serialise
+        for name in model._fields:
+            setattr(self, name, dict_layout(getattr(model, name)))
+
+
+def dict_layout(v):
+    if isinstance(v, _Model):
+        return DictModel(v)
+    if isinstance(v, tuple):
+        return [dict_layout(e) for e in v]
+    if isinstance(v, MappingProxyType):
+        return {k: dict_layout(e) for k, e in v.items()}
+    return v
+
+
+LAYOUTS = {
+    # The decoded JSON alone, for scale
+    'payload': lambda j: j,
+    'dict_based': lambda j: DictModel(Addon(j, True, None)),
+    'eager': lambda j: Addon(j, True, None),
+    # The lazy model holds on to the payload, so its size is part of the cost
+    'lazy': lambda j: Addon(j, True, None, True),
+    'lazy_after_id_and_name': lambda j: touch(Addon(j, True, None, True), 'id', 'name'),
+}
+
+
+def touch(model: _Model, *names: str) -> _Model:
+    for name in names:
+        getattr(model, name)
+    return model
+
+
+def measure(raw: str, n: int, build) -> float:
+    gc.collect()
+    tracemalloc.start()
+    # Payloads are decoded while tracing, so whatever a layout keeps alive of them is counted too
+    objects = [build(json.loads(raw)) for _ in range(n)]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / n
+
+
+def run(n: int = 1000) -> dict:
+    raw = json.dumps(load_fixture('addon'))
+    return {f'{name}_bytes_per_addon': measure(raw, n, build) for name, build in LAYOUTS.items()}
+
+
+def main(n: int = 1000):
+    for name, size in run(n).items():
+        print(f'{name[:-len("_bytes_per_addon")]}: {size:.0f} bytes/addon')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
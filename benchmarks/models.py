@@ -0,0 +1,56 @@
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from objects import Addon, AddonFile, FingerprintResponse, Minecraft, ModLoader, ModLoaderDetails  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+CASES = (
+    ('Addon', 'addon', Addon, False),
+    ('Addon (search page)', 'search', Addon, True),
+    ('AddonFile (file list)', 'files', AddonFile, True),
+    ('FingerprintResponse', 'fingerprint', FingerprintResponse, False),
+    ('Minecraft (version list)', 'minecraft', Minecraft, True),
+    ('ModLoader (list)', 'modloader', ModLoader, True),
+    ('ModLoaderDetails', 'modloader_details', ModLoaderDetails, False),
+)
+
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURES, name + '.json')) as f:
+        return json.load(f)
+
+
+def bench(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def run(number: int = 200) -> dict:
+    results = {}
+    for name, fixture, t, many in CASES:
+        raw = json.dumps(load_fixture(fixture))
+        j = json.loads(raw)
+        build = (lambda **kw: [t(e, **kw) for e in j]) if many else (lambda **kw: t(j, **kw))
+        results[name] = {
+            'objects': len(j) if many else 1,
+            'payload_bytes': len(raw),
+            'decode_ms': bench(lambda: json.loads(raw), number) * 1000,
+            'build_ms': bench(build, number) * 1000,
+            'build_no_dates_ms': bench(lambda: build(serialise_date=False), number) * 1000,
+            'build_lazy_ms': bench(lambda: build(lazy=True), number) * 1000,
+        }
+    return results
+
+
+def main(number: int = 200):
+    for name, r in run(number).items():
+        print(f'{name} x{r["objects"]}: decode {r["decode_ms"]:.3f} ms, build {r["build_ms"]:.3f} ms, '
+              f'without dates {r["build_no_dates_ms"]:.3f} ms, lazy {r["build_lazy_ms"]:.3f} ms')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,97 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aiohttp  # noqa: E402
+import dates  # noqa: E402
+import memory  # noqa: E402
+import models  # noqa: E402
+import throughput  # noqa: E402
+
+SUITES = ('throughput', 'models', 'dates', 'memory')
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    try:
+        import orjson  # noqa: F401
+        json_backend = 'orjson'
+    except ImportError:
+        json_backend = 'json'
+    return {
+        'commit': commit,
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'aiohttp': aiohttp.__version__,
+        'json': json_backend,
+    }
+
+
+def flatten(results: dict, prefix: str = '') -> dict:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{prefix}{key}.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(base: dict, head: dict):
+    # Ratios above 1 mean head is larger: slower for *_ms and seconds, faster for *_per_second
+    old, new = flatten(base['results']), flatten(head['results'])
+    print(f'{base["environment"]["commit"]} -> {head["environment"]["commit"]}')
+    for key in sorted(old.keys() & new.keys()):
+        if old[key]:
+            print(f'{key}: {old[key]:.4g} -> {new[key]:.4g} ({new[key] / old[key]:.2f}x)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the benchmark suites and write the results as JSON')
+    parser.add_argument('--suite', action='append', choices=SUITES, help='repeatable; default all')
+    parser.add_argument('--output', help='file to write the results to; default stdout')
+    parser.add_argument('--compare', metavar='BASELINE', help='results file from an earlier run to compare against')
+    parser.add_argument('--model-iterations', type=int, default=200)
+    parser.add_argument('--date-files', type=int, default=10000)
+    parser.add_argument('--memory-addons', type=int, default=1000)
+    throughput.add_arguments(parser)
+    args = parser.parse_args()
+
+    suites = args.suite or SUITES
+    results = {}
+    if 'throughput' in suites:
+        results['throughput'] = throughput.run_args(args)
+    if 'models' in suites:
+        results['models'] = models.run(args.model_iterations)
+    if 'dates' in suites:
+        results['dates'] = dates.run(args.date_files)
+    if 'memory' in suites:
+        results['memory'] = memory.run(args.memory_addons)
+    report = {'environment': environment(), 'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
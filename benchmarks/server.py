@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import json
+import os
+
+from aiohttp import web
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURES, name + '.json')) as f:
+        return json.load(f)
+
+
+def make_app(latency: float = 0) -> web.Application:
+    # Fixtures are serialised once up front so the server's own JSON encoding stays out of the measurements
+    addon = load_fixture('addon')
+    payloads = {name: json.dumps(load_fixture(name)).encode() for name in
+                ('search', 'files', 'fingerprint', 'minecraft', 'modloader', 'modloader_details')}
+    addon_bytes = json.dumps(addon).encode()
+    version_bytes = {v['versionString']: json.dumps(v).encode() for v in load_fixture('minecraft')}
+    file_bytes = {f['id']: json.dumps(f).encode() for f in load_fixture('files')}
+    any_file = next(iter(file_bytes.values()))
+
+    def respond(body: bytes) -> web.Response:
+        return web.Response(body=body, content_type='application/json')
+
+    @web.middleware
+    async def delay(request, handler):
+        if latency:
+            await asyncio.sleep(latency)
+        return await handler(request)
+
+    async def get_addon(request):
+        return respond(addon_bytes)
+
+    async def get_addons(request):
+        ids = await request.json()
+        return respond(b'[' + b','.join(addon_bytes for _ in ids) + b']')
+
+    async def search(request):
+        return respond(payloads['search'])
+
+    async def files(request):
+        return respond(payloads['files'])
+
+    async def file(request):
+        return respond(file_bytes.get(int(request.match_info['file_id']), any_file))
+
+    async def description(request):
+        return web.Response(text=addon['summary'])
+
+    async def fingerprint(request):
+        await request.read()
+        return respond(payloads['fingerprint'])
+
+    async def minecraft_versions(request):
+        return respond(payloads['minecraft'])
+
+    async def minecraft_version(request):
+        return respond(version_bytes.get(request.match_info['version'], b'null'))
+
+    async def modloaders(request):
+        return respond(payloads['modloader'])
+
+    async def modloader(request):
+        return respond(payloads['modloader_details'])
+
+    app = web.Application(middlewares=[delay])
+    app.router.add_get('/addon/search', search)
+    app.router.add_get('/addon/{addon_id}', get_addon)
+    app.router.add_post('/addon', get_addons)
+    app.router.add_get('/addon/{addon_id}/description', description)
+    app.router.add_get('/addon/{addon_id}/files', files)
+    app.router.add_get('/addon/{addon_id}/file/{file_id}', file)
+    app.router.add_post('/fingerprint', fingerprint)
+    app.router.add_get('/minecraft/version', minecraft_versions)
+    app.router.add_get('/minecraft/version/{version}', minecraft_version)
+    app.router.add_get('/minecraft/modloader', modloaders)
+    app.router.add_get('/minecraft/modloader/{key}', modloader)
+    return app
+
+
+async def start(host: str = '127.0.0.1', port: int = 0, latency: float = 0):
+    runner = web.AppRunner(make_app(latency), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f'http://{host}:{port}/'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the CurseForge API serving recorded fixtures')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0, help='seconds added to every response')
+    args = parser.parse_args()
+    web.run_app(make_app(args.latency), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import curseforge  # noqa: E402
+import server  # noqa: E402
+from metrics import Metrics  # noqa: E402
+
+VERSIONS = [v['versionString'] for v in server.load_fixture('minecraft')]
+
+# Ids vary per call so concurrent calls aren't coalesced into one request; the list endpoints take no
+# arguments, so for those `requests` in the results shows how many calls coalescing saved
+SCENARIOS = {
+    'get_addon': lambda cf, i: cf.get_addon(i),
+    'get_addons[50]': lambda cf, i: cf.get_addons(range(i * 50, i * 50 + 50)),
+    'search_addons': lambda cf, i: cf.search_addons(432, index=i),
+    'get_addon_files': lambda cf, i: cf.get_addon_files(i),
+    'get_addon_file': lambda cf, i: cf.get_addon_file(238222, i),
+    'get_fingerprint_addons': lambda cf, i: cf.get_fingerprint_addons([i, i + 1]),
+    'get_minecraft_versions': lambda cf, i: cf.get_minecraft_versions(),
+    'get_minecraft_version': lambda cf, i: cf.get_minecraft_version(VERSIONS[i % len(VERSIONS)]),
+    'get_mod_loaders': lambda cf, i: cf.get_mod_loaders(),
+    'get_mod_loader_details': lambda cf, i: cf.get_mod_loader_details(f'forge-{i}'),
+}
+
+
+def percentile(values, q: float) -> float:
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+async def run_scenario(cf: curseforge.CurseForge, call, calls: int, concurrency: int) -> dict:
+    metrics = Metrics()
+    cf.on_request_end(metrics.record)
+    latencies = []
+    ids = iter(range(calls))
+
+    async def worker():
+        for i in ids:
+            start = time.perf_counter()
+            await call(cf, i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    endpoints = list(metrics.endpoints.values())
+
+    def mean_ms(name):
+        count = sum(getattr(m, name).count for m in endpoints)
+        return sum(getattr(m, name).sum for m in endpoints) / count * 1000 if count else None
+
+    return {
+        'calls': calls,
+        'concurrency': concurrency,
+        'requests': sum(m.requests for m in endpoints),
+        'seconds': elapsed,
+        'calls_per_second': calls / elapsed,
+        'latency_ms': {
+            'mean': sum(latencies) / len(latencies) * 1000,
+            'p50': percentile(latencies, 0.5) * 1000,
+            'p90': percentile(latencies, 0.9) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+            'max': latencies[-1] * 1000,
+        },
+        'network_ms': mean_ms('network'),
+        'decode_ms': mean_ms('decode'),
+        'build_ms': mean_ms('build'),
+        'bytes_per_request': sum(m.size.sum for m in endpoints) / max(sum(m.size.count for m in endpoints), 1),
+    }
+
+
+async def run(calls: int = 200, concurrency=(1, 8, 32), scenarios=None, url: str = None, latency: float = 0,
+              lazy_models: bool = False) -> dict:
+    runner = None
+    if url is None:
+        # In-process server: it shares the CPU with the client, so compare runs made the same way
+        runner, url = await server.start(latency=latency)
+    results = {}
+    try:
+        for name in scenarios or SCENARIOS:
+            results[name] = {}
+            for c in concurrency:
+                # A fresh client per run so one scenario's pool and hooks don't leak into the next
+                async with curseforge.CurseForge(lazy_models=lazy_models, base_url=url) as cf:
+                    await SCENARIOS[name](cf, 0)
+                    results[name][f'c={c}'] = await run_scenario(cf, SCENARIOS[name], calls, c)
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--calls', type=int, default=200, help='calls per scenario and concurrency level')
+    parser.add_argument('--concurrency', default='1,8,32', help='comma-separated concurrency levels')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='repeatable; default all')
+    parser.add_argument('--url', help='benchmark a server that is already running instead of an in-process one')
+    parser.add_argument('--latency', type=float, default=0, help='seconds the in-process server adds to responses')
+    parser.add_argument('--lazy-models', action='store_true')
+
+
+def run_args(args: argparse.Namespace) -> dict:
+    return asyncio.run(run(args.calls, [int(c) for c in args.concurrency.split(',')], args.scenario, args.url,
+                           args.latency, args.lazy_models))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end CurseForge client throughput against the mock server')
+    add_arguments(parser)
+    for name, runs in run_args(parser.parse_args()).items():
+        for r in runs.values():
+            print(f'{name} c={r["concurrency"]}: {r["calls_per_second"]:.0f} calls/s, '
+                  f'p50 {r["latency_ms"]["p50"]:.2f} ms, p99 {r["latency_ms"]["p99"]:.2f} ms, {r["requests"]} requests')
+
+
+if __name__ == '__main__':
+    main()
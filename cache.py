@@ -0,0 +1,102 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+
+class CacheEntry:
+    __slots__ = ('value', 'expires', 'etag', 'last_modified')
+
+    def __init__(self, value: Any, ttl: float, etag: str = None, last_modified: str = None):
+        self.value = value
+        self.expires: float = time.monotonic() + ttl
+        self.etag: Optional[str] = etag
+        self.last_modified: Optional[str] = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires
+
+    @property
+    def revalidatable(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def renew(self, ttl: float):
+        self.expires = time.monotonic() + ttl
+
+
+class Cache(ABC):
+
+    def __init__(self):
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: float, etag: str = None, last_modified: str = None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: Hashable):
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def items(self) -> Iterable[Tuple[Hashable, CacheEntry]]:
+        raise NotImplementedError
+
+
+class MemoryCache(Cache):
+
+    def __init__(self, max_size: int = 1024):
+        super().__init__()
+        self.max_size = max_size
+        self.__entries: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.__entries.move_to_end(key)
+        if entry.fresh:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        # Stale entries are handed back only if they can be revalidated with a conditional request
+        if entry.revalidatable:
+            return entry
+        del self.__entries[key]
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: float, etag: str = None, last_modified: str = None):
+        if ttl <= 0 and etag is None and last_modified is None:
+            return
+        self.__entries[key] = CacheEntry(value, ttl, etag, last_modified)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self.__entries.pop(key, None)
+
+    def clear(self):
+        self.__entries.clear()
+
+    def items(self) -> Iterable[Tuple[Hashable, CacheEntry]]:
+        return list(self.__entries.items())
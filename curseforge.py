@@ -1,9 +1,38 @@
+import asyncio
+import codecs
+import json
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
 import aiohttp
 
+try:
+    import orjson
+    _default_loads = orjson.loads
+except ImportError:
+    _default_loads = json.loads
+
+from cache import Cache, CacheEntry, MemoryCache
+from metrics import RequestEvent
+from ratelimit import RateLimiter
+from retry import CircuitBreaker, RetryPolicy, parse_retry_after
 from objects import *
+from objects import _Model, _ModelMeta
 
 __base_url__ = 'https://addons-ecs.forgesvc.net/api/v2/'
 
+DEFAULT_TTLS = {
+    'game': 6 * 3600,
+    'category': 6 * 3600,
+    'minecraft': 6 * 3600,
+    'addon': 5 * 60,
+    'fingerprint': 30 * 60,
+}
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
 
 class CurseForgeException(Exception):
 
@@ -11,68 +40,542 @@ class CurseForgeException(Exception):
         self.response: aiohttp.ClientResponse = r
 
 
+class CircuitOpenError(CurseForgeException):
+
+    def __init__(self):
+        super().__init__(None)
+
+
+class AddonNotFoundError(CurseForgeException):
+
+    def __init__(self, addon_id: int):
+        super().__init__(None)
+        self.addon_id = addon_id
+
+
+class FingerprintMatchError(CurseForgeException):
+
+    def __init__(self, partial: FingerprintResponse, failed: List[int], errors: List[BaseException]):
+        super().__init__(None)
+        # The merged result of the chunks that did answer, and the fingerprints of the ones that didn't
+        self.partial = partial
+        self.failed = failed
+        self.errors = errors
+
+
+class AddonBatchError(CurseForgeException):
+
+    def __init__(self, partial: Tuple[Addon, ...], failed: List[int], errors: List[BaseException]):
+        super().__init__(None)
+        # The addons from the chunks that did answer, and the ids of the ones that didn't
+        self.partial = partial
+        self.failed = failed
+        self.errors = errors
+
+
 def _default_error(c):
     raise c
 
 
+def _retrieve_exception(future: asyncio.Future):
+    if not future.cancelled():
+        future.exception()
+
+
+_single_attempt = RetryPolicy(attempts=1)
+
+
+_json_decoder = json.JSONDecoder()
+
+
+def _decode_array_items(buf: str, pos: int, final: bool):
+    items = []
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\n\r,':
+            pos += 1
+        if pos == len(buf) or buf[pos] == ']':
+            return items, pos
+        try:
+            item, end = _json_decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return items, pos
+        # A number cut off by the chunk boundary decodes fine but isn't followed by a delimiter yet
+        if not final and (end == len(buf) or buf[end] not in ' \t\n\r,]'):
+            return items, pos
+        items.append(item)
+        pos = end
+
+
+async def _iter_json_array(content: aiohttp.StreamReader, chunk_size: int = 1 << 16) -> AsyncIterator:
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buf = ''
+    pos = None
+    async for chunk in content.iter_chunked(chunk_size):
+        buf += decoder.decode(chunk)
+        if pos is None:
+            stripped = buf.lstrip()
+            if not stripped:
+                continue
+            if stripped[0] != '[':
+                raise ValueError('Expected a JSON array')
+            buf, pos = stripped, 1
+        items, pos = _decode_array_items(buf, pos, False)
+        buf, pos = buf[pos:], 0
+        for item in items:
+            yield item
+    if pos is None:
+        raise ValueError('Expected a JSON array')
+    buf += decoder.decode(b'', True)
+    items, pos = _decode_array_items(buf, pos, True)
+    for item in items:
+        yield item
+    # A body cut off between elements decodes cleanly, so only the closing bracket tells it was complete
+    if pos == len(buf):
+        raise ValueError('Truncated JSON array')
+
+
+def _encode_models(obj):
+    # JSON objects pass through, so every JSON array below is a tag naming what it holds
+    if obj is None or isinstance(obj, (str, int, float)):
+        return obj
+    if isinstance(obj, _Model):
+        return ['m', type(obj).__name__, obj.to_json(), obj._serialise, obj._lazy]
+    if isinstance(obj, dict):
+        if all(isinstance(k, str) for k in obj):
+            return {k: _encode_models(v) for k, v in obj.items()}
+        return ['d', [[_encode_models(k), _encode_models(v)] for k, v in obj.items()]]
+    if isinstance(obj, tuple):
+        return ['t', [_encode_models(v) for v in obj]]
+    if isinstance(obj, list):
+        return ['l', [_encode_models(v) for v in obj]]
+    raise TypeError(f"Can't store {type(obj).__name__} objects")
+
+
+def _decode_models(obj, cf, lazy: Optional[bool] = None):
+    if isinstance(obj, dict):
+        return {k: _decode_models(v, cf, lazy) for k, v in obj.items()}
+    if not isinstance(obj, list):
+        return obj
+    tag = obj[0]
+    if tag == 'm':
+        t = _ModelMeta.registry.get(obj[1])
+        if t is None:
+            raise ValueError(f'Unknown model {obj[1]!r}')
+        if not isinstance(obj[2], dict):
+            # A lazy model would only trip over this on first access
+            raise ValueError(f'{obj[1]} payload is not an object')
+        return t(obj[2], obj[3], cf, obj[4] if lazy is None else lazy)
+    if tag == 'd':
+        return {_decode_models(k, cf, lazy): _decode_models(v, cf, lazy) for k, v in obj[1]}
+    if tag == 't':
+        return tuple(_decode_models(v, cf, lazy) for v in obj[1])
+    if tag == 'l':
+        return [_decode_models(v, cf, lazy) for v in obj[1]]
+    raise ValueError(f'Unknown tag {tag!r}')
+
+
 class CurseForge:
 
-    def __init__(self, session: aiohttp.ClientSession = aiohttp.ClientSession()):
+    def __init__(self, session: aiohttp.ClientSession = None, cache: Cache = None,
+                 ttls: Dict[str, float] = None, batch_window: float = 0, batch_size: int = 100,
+                 lazy_models: bool = False, json_loads: Callable = None,
+                 limiter: RateLimiter = None, retry: RetryPolicy = None, breaker: CircuitBreaker = None,
+                 pool_size: int = 100, pool_size_per_host: int = 0, keepalive_timeout: float = 30,
+                 dns_cache_ttl: int = 300, timeout: aiohttp.ClientTimeout = None, compress: bool = True,
+                 fingerprint_chunk_size: int = 1000, fingerprint_retry: RetryPolicy = None,
+                 fingerprint_cache: Cache = None, fingerprint_cache_size: int = 10000,
+                 base_url: str = __base_url__):
         self.__session = session
+        self.base_url = base_url
+        self.__owns_session = session is None
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout or aiohttp.ClientTimeout(total=60, sock_connect=10)
+        self.compress = compress
         self.__error = _default_error
+        self.__on_start: List[Callable[[RequestEvent], None]] = []
+        self.__on_end: List[Callable[[RequestEvent], None]] = []
+        self.cache = cache
+        self.ttls = dict(DEFAULT_TTLS) if ttls is None else ttls
+        self.__in_flight: Dict[tuple, asyncio.Future] = {}
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.__batches: Dict[bool, Dict[int, asyncio.Future]] = {}
+        self.__batch_timers: Dict[bool, asyncio.TimerHandle] = {}
+        self.__batch_tasks: Set[asyncio.Task] = set()
+        self.lazy_models = lazy_models
+        self.json_loads = json_loads or _default_loads
+        self.limiter = limiter or RateLimiter()
+        self.retry = retry or _single_attempt
+        self.breaker = breaker
+        self.fingerprint_chunk_size = fingerprint_chunk_size
+        # Chunks are retried on their own so one failure doesn't cost the whole scan
+        self.fingerprint_retry = fingerprint_retry or retry or RetryPolicy()
+        # Matches are cached one entry per fingerprint, so they get their own store rather than evicting everything else
+        if fingerprint_cache is None and cache is not None:
+            fingerprint_cache = MemoryCache(fingerprint_cache_size)
+        self.fingerprint_cache = fingerprint_cache
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # Created on first use so it binds to the running loop rather than whatever exists at import time
+        if self.__session is None or self.__owns_session and self.__session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size_per_host,
+                                             keepalive_timeout=self.keepalive_timeout,
+                                             ttl_dns_cache=self.dns_cache_ttl)
+            headers = None if self.compress else {'Accept-Encoding': 'identity'}
+            self.__session = aiohttp.ClientSession(connector=connector, timeout=self.timeout, headers=headers)
+            self.__owns_session = True
+        return self.__session
+
+    async def close(self):
+        # Pending batches are sent rather than dropped, and finish before the session goes away
+        for serialise_date in list(self.__batches):
+            self.__flush_addons(serialise_date)
+        if self.__batch_tasks:
+            await asyncio.gather(*self.__batch_tasks, return_exceptions=True)
+        if self.__owns_session and self.__session is not None and not self.__session.closed:
+            await self.__session.close()
 
     def error(self, func):
         self.__error = func
 
-    async def __get(self, path: str, t, serialise_date: bool = True):
-        async with self.__session.get(__base_url__ + path) as r:
+    def on_request_start(self, func):
+        self.__on_start.append(func)
+        return func
+
+    def on_request_end(self, func):
+        self.__on_end.append(func)
+        return func
+
+    def __begin(self, method: str, path: str) -> Optional[RequestEvent]:
+        # Without hooks no event is built, leaving only a few perf_counter calls on the request path
+        if not self.__on_start and not self.__on_end:
+            return None
+        event = RequestEvent(method, path)
+        for hook in self.__on_start:
+            hook(event)
+        return event
+
+    def __end(self, event: RequestEvent):
+        event.elapsed = time.perf_counter() - event.start
+        if event.network is None:
+            event.network = event.elapsed
+        for hook in self.__on_end:
+            hook(event)
+
+    def __cache_hit(self, path: str):
+        event = self.__begin('GET', path)
+        if event is not None:
+            event.cached = True
+            event.network = 0
+            self.__end(event)
+
+    async def __read(self, r: aiohttp.ClientResponse, event: Optional[RequestEvent]) -> bytes:
+        body = await r.read()
+        if event is not None:
+            event.size = len(body)
+            event.network = time.perf_counter() - event.start
+        return body
+
+    def __decode(self, body: bytes, build, event: Optional[RequestEvent]):
+        start = time.perf_counter()
+        j = self.json_loads(body)
+        decoded = time.perf_counter()
+        value = j if build is None else build(j)
+        if event is not None:
+            event.decode = decoded - start
+            event.build = time.perf_counter() - decoded
+        return value
+
+    @staticmethod
+    def dump_models(obj: Any) -> bytes:
+        # Plain JSON rather than pickle, so loading untrusted data can only ever build models.
+        # The stdlib encoder is used because it round-trips the infinite TTLs orjson writes as null.
+        return json.dumps(_encode_models(obj), separators=(',', ':')).encode()
+
+    def load_models(self, data: bytes, lazy: bool = None) -> Any:
+        # lazy overrides how each model was stored, e.g. so a bulk restore decodes nothing up front
+        return _decode_models(json.loads(data), self, lazy)
+
+    def __ttl(self, path: str) -> float:
+        path = path.split('?', 1)[0].rstrip('/')
+        while path:
+            ttl = self.ttls.get(path)
+            if ttl is not None:
+                return ttl
+            path = path.rpartition('/')[0]
+        return 0
+
+    @asynccontextmanager
+    async def __request(self, method: str, path: str, event: RequestEvent = None, retry: RetryPolicy = None,
+                        **kwargs) -> AsyncIterator[Optional[aiohttp.ClientResponse]]:
+        policy = retry or self.retry
+        breaker = self.breaker
+        attempt = 0
+        try:
+            while True:
+                if breaker is not None and not breaker.allow():
+                    # There's no response, so a handler that doesn't raise makes the call return None
+                    self.__error(CircuitOpenError())
+                    yield None
+                    return
+                async with self.limiter.limit(path):
+                    try:
+                        r = await self.session.request(method, self.base_url + path, **kwargs)
+                    except policy.exceptions:
+                        if breaker is not None:
+                            breaker.failure()
+                        delay = policy.delay(attempt)
+                        if delay is None:
+                            raise
+                    except Exception:
+                        if breaker is not None:
+                            breaker.failure()
+                        raise
+                    except BaseException:
+                        # Cancelled: no verdict on the upstream, but a half-open probe must not stay checked out
+                        if breaker is not None:
+                            breaker.abandon()
+                        raise
+                    else:
+                        failed = r.status == 429 or r.status >= 500
+                        if breaker is not None:
+                            if failed:
+                                breaker.failure()
+                            else:
+                                breaker.success()
+                        delay = policy.delay(attempt, parse_retry_after(r.headers.get('Retry-After'))) \
+                            if r.status in policy.statuses else None
+                        if delay is None:
+                            if event is not None:
+                                event.status = r.status
+                            try:
+                                yield r
+                            finally:
+                                r.release()
+                            return
+                        r.release()
+                await asyncio.sleep(delay)
+                attempt += 1
+        except BaseException as e:
+            if event is not None:
+                event.error = e
+            raise
+        finally:
+            if event is not None:
+                event.attempts = attempt + 1
+                self.__end(event)
+
+    async def __coalesce(self, key, request):
+        task = self.__in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(request())
+            self.__in_flight[key] = task
+            task.add_done_callback(lambda t: self.__settle(key, t))
+        # Shielded so a cancelled waiter doesn't cancel the request shared with the others
+        return await asyncio.shield(task)
+
+    def __settle(self, key, task: asyncio.Future):
+        self.__in_flight.pop(key, None)
+        # Retrieves the exception so a request whose waiters were all cancelled doesn't log it as unhandled
+        _retrieve_exception(task)
+
+    async def __cached_get(self, path: str, params, build, variant):
+        key = ('GET', path, tuple(sorted(params.items())) if params else None, variant)
+        entry = None
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry is not None and entry.fresh:
+                self.__cache_hit(path)
+                return entry.value
+        return await self.__coalesce(key, lambda: self.__send_get(key, path, params, build, entry))
+
+    async def __send_get(self, key, path: str, params, build, entry: Optional[CacheEntry]):
+        headers = None
+        if entry is not None:
+            headers = {}
+            if entry.etag is not None:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified is not None:
+                headers['If-Modified-Since'] = entry.last_modified
+        event = self.__begin('GET', path)
+        async with self.__request('GET', path, event, params=params, headers=headers) as r:
+            if r is None:
+                return None
+            if r.status == 304 and entry is not None:
+                entry.renew(self.__ttl(path))
+                self.cache.revalidations += 1
+                if event is not None:
+                    event.revalidated = True
+                return entry.value
             if r.ok:
-                return t(await r.json(), serialise_date, self)
+                body = await self.__read(r, event)
+                value = body.decode(r.get_encoding()) if build is None else self.__decode(body, build, event)
+                if self.cache is not None:
+                    self.cache.set(key, value, self.__ttl(path), r.headers.get('ETag'), r.headers.get('Last-Modified'))
+                return value
             else:
                 self.__error(CurseForgeException(r))
 
+    async def __get(self, path: str, t, serialise_date: bool = True):
+        return await self.__cached_get(path, None, lambda j: t(j, serialise_date, self, self.lazy_models), serialise_date)
+
     async def __get_text(self, path: str, params=None):
-        async with self.__session.get(__base_url__ + path, params=params) as r:
-            if r.ok:
-                return await r.text()
-            else:
-                self.__error(CurseForgeException(r))
+        return await self.__cached_get(path, params, None, None)
 
     async def __multi_get(self, path: str, t, params=None, serialise_date: bool = True):
-        async with self.__session.get(__base_url__ + path, params=params) as r:
+        return await self.__cached_get(path, params, lambda j: tuple(t(e, serialise_date, self, self.lazy_models) for e in j),
+                                       serialise_date)
+
+    async def __coalesced_post(self, path: str, j, build, variant, retry: RetryPolicy = None):
+        body = json.dumps(j, sort_keys=True, default=list)
+        return await self.__coalesce(('POST', path, body, variant), lambda: self.__send_post(path, body, build, retry))
+
+    async def __send_post(self, path: str, body: str, build, retry: RetryPolicy = None):
+        event = self.__begin('POST', path)
+        async with self.__request('POST', path, event, retry, data=body, headers=JSON_HEADERS) as r:
+            if r is None:
+                return None
             if r.ok:
-                return map(lambda e: t(e, serialise_date, self), await r.json())
+                return self.__decode(await self.__read(r, event), build, event)
             else:
                 self.__error(CurseForgeException(r))
 
     async def __post_json(self, path: str, j=None):
-        async with self.__session.post(__base_url__ + path, json=j) as r:
-            if r.ok:
-                return await r.json()
-            else:
-                self.__error(CurseForgeException(r))
+        return await self.__coalesced_post(path, j, None, None)
 
     async def __post(self, path: str, t, j=None, serialise_date: bool = True):
-        j = await self.__post_json(path, j)
-        if j:
-            return t(j, serialise_date, self)
+        return await self.__coalesced_post(path, j, lambda r: t(r, serialise_date, self, self.lazy_models) if r else None,
+                                           serialise_date)
 
     async def __multi_post(self, path: str, t, j=None, serialise_date: bool = True):
-        async with self.__session.post(__base_url__ + path, json=j) as r:
+        return await self.__coalesced_post(path, j, lambda r: tuple(t(e, serialise_date, self, self.lazy_models) for e in r),
+                                           serialise_date)
+
+    async def __stream(self, method: str, path: str, t, serialise_date: bool, params=None, j=None):
+        data = None if j is None else json.dumps(j, default=list)
+        async with self.__request(method, path, self.__begin(method, path), params=params, data=data,
+                                  headers=JSON_HEADERS) as r:
+            if r is None:
+                return
             if r.ok:
-                return map(lambda e: t(e, serialise_date, self), await r.json())
+                async for e in _iter_json_array(r.content):
+                    yield t(e, serialise_date, self, self.lazy_models)
             else:
                 self.__error(CurseForgeException(r))
 
+    def __queue_addon(self, addon_id: int, serialise_date: bool) -> asyncio.Future:
+        batch = self.__batches.setdefault(serialise_date, {})
+        future = batch.get(addon_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = batch[addon_id] = loop.create_future()
+            # Every waiter may have been cancelled by the time the batch fails
+            future.add_done_callback(_retrieve_exception)
+            if len(batch) >= self.batch_size:
+                self.__flush_addons(serialise_date)
+            elif len(batch) == 1:
+                self.__batch_timers[serialise_date] = loop.call_later(self.batch_window, self.__flush_addons,
+                                                                      serialise_date)
+        return future
+
+    def __flush_addons(self, serialise_date: bool):
+        timer = self.__batch_timers.pop(serialise_date, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self.__batches.pop(serialise_date, None)
+        if batch:
+            task = asyncio.ensure_future(self.__send_addons(batch, serialise_date))
+            self.__batch_tasks.add(task)
+            task.add_done_callback(self.__batch_tasks.discard)
+
+    async def __send_addons(self, batch: Dict[int, asyncio.Future], serialise_date: bool):
+        try:
+            addons = await self.get_addons(list(batch), serialise_date)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        if addons is None:
+            # The error hook has already seen the failed bulk request and chose not to raise
+            for future in batch.values():
+                if not future.done():
+                    future.set_result(None)
+            return
+        found = {a.id: a for a in addons}
+        ttl = self.__ttl('addon')
+        for addon_id, future in batch.items():
+            addon = found.get(addon_id)
+            if future.done():
+                continue
+            if addon is None:
+                # Unknown ids go through the error hook, like the 404 an unbatched get_addon gets
+                try:
+                    self.__error(AddonNotFoundError(addon_id))
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(None)
+                continue
+            if self.cache is not None:
+                self.cache.set(('GET', f'addon/{addon_id}', None, serialise_date), addon, ttl)
+            future.set_result(addon)
+
     async def get_addon(self, addon_id, serialise_date: bool = True) -> Addon:
-        return await self.__get(f'addon/{addon_id}', Addon, serialise_date)
+        if not self.batch_window:
+            return await self.__get(f'addon/{addon_id}', Addon, serialise_date)
+        addon_id = int(addon_id)
+        if self.cache is not None:
+            entry = self.cache.get(('GET', f'addon/{addon_id}', None, serialise_date))
+            if entry is not None and entry.fresh:
+                self.__cache_hit(f'addon/{addon_id}')
+                return entry.value
+        return await asyncio.shield(self.__queue_addon(addon_id, serialise_date))
+
+    async def get_addons(self, addon_ids: Iterable, serialise_date: bool = True,
+                         chunk_size: int = None) -> Iterable[Addon]:
+        if not chunk_size:
+            return await self.__multi_post('addon', Addon, addon_ids, serialise_date)
+        ids = list(addon_ids)
+        chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+        results = await asyncio.gather(*(self.__multi_post('addon', Addon, c, serialise_date) for c in chunks),
+                                       return_exceptions=True)
+        failed = []
+        errors = []
+        addons = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                failed += chunk
+                errors.append(result)
+            elif result is None:
+                # The error handler already saw this chunk's error and didn't raise
+                failed += chunk
+            else:
+                addons += result
+        addons = tuple(addons)
+        if failed:
+            # As with fingerprints, a failed chunk doesn't throw away the others
+            self.__error(AddonBatchError(addons, failed, errors))
+        return addons
 
-    async def get_addons(self, addon_ids: Iterable, serialise_date: bool = True) -> Iterable[Addon]:
-        return await self.__multi_post('addon', Addon, addon_ids, serialise_date)
+    def stream_addons(self, addon_ids: Iterable, serialise_date: bool = True) -> AsyncIterator[Addon]:
+        return self.__stream('POST', 'addon', Addon, serialise_date, j=addon_ids)
 
     async def search_addons(self, game_id, game_ver: str = None, category_id=0, index: int = 0,
                             name: str = None, section_id=None, sort: bool = 0,
-                            serialise_date: bool = True) -> Iterable[Addon]:
+                            serialise_date: bool = True, page_size: int = None) -> Iterable[Addon]:
         param = {'gameId': game_id}
         if game_ver:
             param['gameVersion'] = game_ver
@@ -86,8 +589,37 @@ class CurseForge:
             param['sectionId'] = section_id
         if sort:
             param['sort'] = int(sort)
+        if page_size:
+            param['pageSize'] = page_size
         return await self.__multi_get('addon/search', Addon, param, serialise_date)
 
+    async def iter_search_addons(self, game_id, game_ver: str = None, category_id=0, name: str = None,
+                                 section_id=None, sort: bool = 0, serialise_date: bool = True,
+                                 page_size: int = 50, prefetch: int = 2) -> AsyncIterator[Addon]:
+        def fetch(page: int) -> asyncio.Future:
+            return asyncio.ensure_future(self.search_addons(game_id, game_ver, category_id, page * page_size, name,
+                                                            section_id, sort, serialise_date, page_size))
+
+        pages = deque(fetch(i) for i in range(prefetch + 1))
+        next_page = len(pages)
+        try:
+            while True:
+                addons = tuple(await pages.popleft() or ())
+                full = len(addons) >= page_size
+                if full:
+                    pages.append(fetch(next_page))
+                    next_page += 1
+                for addon in addons:
+                    yield addon
+                if not full:
+                    break
+        finally:
+            for page in pages:
+                # Prefetched pages may already have failed, so their exceptions are read explicitly
+                # rather than relying on cancel() to silence them
+                page.cancel()
+                page.add_done_callback(_retrieve_exception)
+
     async def get_featured_addons(self, game_id: int, addon_ids: Iterable[int] = (), featured_count: int = 1,
                                   popular_count: int = 1, updated_count: int = 1,
                                   serialise_date: bool = True) -> Iterable[Addon]:
@@ -95,7 +627,7 @@ class CurseForge:
                                    {'gameId': game_id, 'addonsIds': addon_ids, 'featuredCount': featured_count,
                                     'popularCount': popular_count, 'updatedCount': updated_count})
         if j and j['Featured']:
-            return map(lambda a: Addon(a, serialise_date, self), j['Featured'])
+            return tuple(Addon(a, serialise_date, self, self.lazy_models) for a in j['Featured'])
 
     async def get_addon_description(self, addon_id) -> str:
         return await self.__get_text(f'addon/{addon_id}/description')
@@ -103,6 +635,9 @@ class CurseForge:
     async def get_addon_files(self, addon_id, serialise_date: bool = True) -> Iterable[AddonFile]:
         return await self.__multi_get(f'addon/{addon_id}/files', AddonFile, serialise_date=serialise_date)
 
+    def stream_addon_files(self, addon_id, serialise_date: bool = True) -> AsyncIterator[AddonFile]:
+        return self.__stream('GET', f'addon/{addon_id}/files', AddonFile, serialise_date)
+
     async def get_addon_file(self, addon_id, file_id, serialise_date: bool = True) -> AddonFile:
         return await self.__get(f'addon/{addon_id}/file/{file_id}', AddonFile, serialise_date)
 
@@ -112,13 +647,67 @@ class CurseForge:
     async def get_addon_file_download(self, addon_id, file_id) -> str:
         return await self.__get_text(f'addon/{addon_id}/file/{file_id}/download-url')
 
-    async def get_fingerprint_addons(self, fingerprints: Iterable[int],
-                                     serialise_date: bool = True) -> FingerprintResponse:
-        return await self.__post('fingerprint', FingerprintResponse, fingerprints, serialise_date)
+    async def get_fingerprint_addons(self, fingerprints: Iterable[int], serialise_date: bool = True,
+                                     chunk_size: int = None) -> FingerprintResponse:
+        chunk_size = chunk_size or self.fingerprint_chunk_size
+        merged = {'isCacheBuilt': True, 'exactMatches': [], 'exactFingerprints': [], 'partialMatches': [],
+                  'partialMatchFingerprints': {}, 'installedFingerprints': [], 'unmatchedFingerprints': []}
+        unknown = []
+        cache = self.fingerprint_cache
+        for fingerprint in dict.fromkeys(map(int, fingerprints)):
+            entry = cache.get(('POST', 'fingerprint', fingerprint)) if cache is not None else None
+            if entry is None or not entry.fresh:
+                unknown.append(fingerprint)
+            elif entry.value is None:
+                merged['installedFingerprints'].append(fingerprint)
+                merged['unmatchedFingerprints'].append(fingerprint)
+            else:
+                merged['installedFingerprints'].append(fingerprint)
+                merged['exactFingerprints'].append(fingerprint)
+                merged['exactMatches'].append(entry.value)
+        chunks = [unknown[i:i + chunk_size] for i in range(0, len(unknown), chunk_size)]
+        failed = []
+        errors = []
+        results = await asyncio.gather(*(self.__match_fingerprints(c) for c in chunks), return_exceptions=True)
+        for chunk, j in zip(chunks, results):
+            if isinstance(j, BaseException):
+                failed += chunk
+                errors.append(j)
+                continue
+            if j is None:
+                # The error handler already saw this chunk's error and didn't raise
+                failed += chunk
+                continue
+            merged['isCacheBuilt'] = merged['isCacheBuilt'] and j.get('isCacheBuilt', True)
+            for key in ('exactMatches', 'exactFingerprints', 'partialMatches', 'installedFingerprints',
+                        'unmatchedFingerprints'):
+                merged[key] += j.get(key) or ()
+            partial = j.get('partialMatchFingerprints') or {}
+            if isinstance(partial, dict):
+                merged['partialMatchFingerprints'].update(partial)
+        response = FingerprintResponse(merged, serialise_date, self, self.lazy_models)
+        if failed:
+            # One failed chunk doesn't throw away the others; a handler that doesn't raise gets the partial response
+            self.__error(FingerprintMatchError(response, failed, errors))
+        return response
+
+    async def __match_fingerprints(self, fingerprints: list) -> Optional[dict]:
+        j = await self.__coalesced_post('fingerprint', fingerprints, None, None, self.fingerprint_retry)
+        if j and self.fingerprint_cache is not None:
+            # Exact matches and misses are cached per fingerprint; partial matches are always asked again
+            ttl = self.__ttl('fingerprint')
+            for match in j.get('exactMatches') or ():
+                self.fingerprint_cache.set(('POST', 'fingerprint', match['file']['packageFingerprint']), match, ttl)
+            for fingerprint in j.get('unmatchedFingerprints') or ():
+                self.fingerprint_cache.set(('POST', 'fingerprint', fingerprint), None, ttl)
+        return j
 
     async def get_minecraft_versions(self, serialise_date: bool = True) -> Iterable[Minecraft]:
         return await self.__multi_get('minecraft/version', Minecraft, serialise_date=serialise_date)
 
+    def stream_minecraft_versions(self, serialise_date: bool = True) -> AsyncIterator[Minecraft]:
+        return self.__stream('GET', 'minecraft/version', Minecraft, serialise_date)
+
     async def get_minecraft_version(self, version_name: str, serialise_date: bool = True) -> Minecraft:
         return await self.__get('minecraft/version/' + version_name, Minecraft, serialise_date)
 
@@ -0,0 +1,93 @@
+import asyncio
+import os
+from typing import Callable, Iterable, List, Optional
+
+import aiohttp
+
+from curseforge import CurseForge
+from fingerprint import fingerprint_file
+from objects import AddonFile
+
+
+class DownloadError(Exception):
+
+    def __init__(self, file: AddonFile, reason: str):
+        super().__init__(f'{file.file_name}: {reason}')
+        self.file = file
+
+
+class Downloader:
+
+    def __init__(self, cf: CurseForge, directory: str, concurrency: int = 4, chunk_size: int = 1 << 16,
+                 progress: Callable[[AddonFile, int, int], None] = None, verify_fingerprint: bool = False):
+        self._cf = cf
+        self.directory = directory
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.verify_fingerprint = verify_fingerprint
+        self.__slots: Optional[asyncio.Semaphore] = None
+
+    def path(self, file: AddonFile) -> str:
+        # The name comes from the server, so only its last component is used and it can't leave the directory
+        name = os.path.basename((file.file_name or '').replace('\\', '/'))
+        if name in ('', '.', '..'):
+            raise DownloadError(file, 'unsafe file name')
+        return os.path.join(self.directory, name)
+
+    async def download(self, file: AddonFile) -> str:
+        if self.__slots is None:
+            self.__slots = asyncio.Semaphore(self.concurrency)
+        async with self.__slots:
+            return await self.__download(file)
+
+    async def download_all(self, files: Iterable[AddonFile]) -> List[str]:
+        return await asyncio.gather(*(self.download(f) for f in files))
+
+    async def __download(self, file: AddonFile) -> str:
+        path = self.path(file)
+        if os.path.isfile(path) and os.path.getsize(path) == file.size:
+            return path
+        if not file.download_url:
+            raise DownloadError(file, 'no download URL')
+        os.makedirs(self.directory, exist_ok=True)
+        part = path + '.part'
+        done = os.path.getsize(part) if os.path.isfile(part) else 0
+        if done > file.size:
+            done = 0
+        if done < file.size and not await self.__fetch(file, part, done):
+            # The server can't resume from the stale partial file, start over
+            await self.__fetch(file, part, 0)
+        size = os.path.getsize(part)
+        if size != file.size:
+            os.remove(part)
+            raise DownloadError(file, f'expected {file.size} bytes, got {size}')
+        if self.verify_fingerprint and file.package_fingerprint is not None:
+            fp = await asyncio.get_running_loop().run_in_executor(None, fingerprint_file, part)
+            if fp != int(file.package_fingerprint):
+                os.remove(part)
+                raise DownloadError(file, f'fingerprint mismatch, expected {file.package_fingerprint}, got {fp}')
+        os.replace(part, path)
+        return path
+
+    async def __fetch(self, file: AddonFile, part: str, done: int) -> bool:
+        headers = {'Range': f'bytes={done}-'} if done else None
+        async with self._cf.session.get(file.download_url, headers=headers,
+                                        timeout=aiohttp.ClientTimeout(total=None, sock_read=60)) as r:
+            if r.status == 416 and done:
+                return False
+            if not r.ok:
+                raise DownloadError(file, f'HTTP {r.status}')
+            if r.status != 206:
+                done = 0
+            with open(part, 'ab' if done else 'wb') as f:
+                self.__report(file, done)
+                async for chunk in r.content.iter_chunked(self.chunk_size):
+                    f.write(chunk)
+                    done += len(chunk)
+                    self.__report(file, done)
+        return True
+
+    def __report(self, file: AddonFile, done: int):
+        if self.progress is not None:
+            self.progress(file, done, file.size)
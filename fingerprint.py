@@ -0,0 +1,103 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Tuple
+
+from objects import FingerprintResponse
+
+_M = 0x5bd1e995
+_MASK = 0xffffffff
+_WHITESPACE = b'\t\n\r '
+
+
+def murmur2(data: bytes, seed: int = 1) -> int:
+    length = len(data)
+    h = (seed ^ length) & _MASK
+    body = length & ~3
+    words = array('I')
+    if words.itemsize != 4:
+        words = array('L')
+    words.frombytes(memoryview(data)[:body])
+    if sys.byteorder == 'big':
+        words.byteswap()
+    for k in words:
+        k = (k * _M) & _MASK
+        k ^= k >> 24
+        h = ((h * _M) & _MASK) ^ ((k * _M) & _MASK)
+    tail = length & 3
+    if tail:
+        if tail == 3:
+            h ^= data[body + 2] << 16
+        if tail >= 2:
+            h ^= data[body + 1] << 8
+        h = ((h ^ data[body]) * _M) & _MASK
+    h ^= h >> 13
+    h = (h * _M) & _MASK
+    return h ^ (h >> 15)
+
+
+def fingerprint(data: bytes) -> int:
+    # CurseForge hashes the file with tabs, newlines, carriage returns and spaces removed
+    return murmur2(data.translate(None, _WHITESPACE))
+
+
+def fingerprint_file(path: str) -> int:
+    # One read and one whitespace-stripped copy; the hash needs the stripped length up front, so it can't stream
+    with open(path, 'rb') as f:
+        return fingerprint(f.read())
+
+
+class Fingerprinter:
+
+    def __init__(self, cache_path: str = None, processes: int = None):
+        self.cache_path = cache_path
+        self.processes = processes
+        self.__cache: Dict[str, Tuple[int, int, int]] = {}
+        if cache_path and os.path.isfile(cache_path):
+            with open(cache_path) as f:
+                self.__cache = {k: tuple(v) for k, v in json.load(f).items()}
+
+    def scan(self, paths: Iterable[str]) -> Dict[str, int]:
+        results = {}
+        stale = {}
+        for path in paths:
+            path = os.path.abspath(path)
+            st = os.stat(path)
+            cached = self.__cache.get(path)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                results[path] = cached[2]
+            else:
+                stale[path] = (st.st_mtime_ns, st.st_size)
+        if stale:
+            if len(stale) == 1 or self.processes == 1:
+                hashes = map(fingerprint_file, stale)
+            else:
+                # Spawned rather than forked: match() scans from an executor thread, and forking a threaded process
+                # can leave locks held in the child
+                with ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+                    hashes = list(pool.map(fingerprint_file, stale, chunksize=4))
+            for (path, (mtime, size)), fp in zip(stale.items(), hashes):
+                self.__cache[path] = (mtime, size, fp)
+                results[path] = fp
+            self.save()
+        return results
+
+    def scan_directory(self, directory: str, extension: str = '.jar') -> Dict[str, int]:
+        return self.scan(e.path for e in os.scandir(directory) if e.is_file() and e.name.endswith(extension))
+
+    def save(self):
+        if not self.cache_path:
+            return
+        tmp = self.cache_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.__cache, f)
+        os.replace(tmp, self.cache_path)
+
+    async def match(self, cf, paths: Iterable[str], chunk_size: int = None,
+                    serialise_date: bool = True) -> FingerprintResponse:
+        fingerprints = (await asyncio.get_running_loop().run_in_executor(None, self.scan, list(paths))).values()
+        return await cf.get_fingerprint_addons(fingerprints, serialise_date, chunk_size)
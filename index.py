@@ -0,0 +1,215 @@
+import json
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple, Union
+
+from cache import MemoryCache
+from curseforge import CurseForge
+from objects import Addon, AddonFile, Category, iso_8601_to_datetime
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS addons (
+    id INTEGER PRIMARY KEY,
+    game_id INTEGER,
+    slug TEXT,
+    name TEXT,
+    primary_category_id INTEGER,
+    popularity REAL,
+    download_count REAL,
+    modified_at TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS addons_slug ON addons (slug);
+CREATE INDEX IF NOT EXISTS addons_game_modified ON addons (game_id, modified_at);
+CREATE INDEX IF NOT EXISTS addons_game_popularity ON addons (game_id, popularity);
+CREATE TABLE IF NOT EXISTS addon_versions (
+    addon_id INTEGER,
+    game_version TEXT,
+    mod_loader INTEGER,
+    file_id INTEGER,
+    PRIMARY KEY (addon_id, game_version, file_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS addon_versions_version ON addon_versions (game_version, mod_loader);
+CREATE TABLE IF NOT EXISTS addon_categories (
+    addon_id INTEGER,
+    category_id INTEGER,
+    PRIMARY KEY (addon_id, category_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS addon_categories_category ON addon_categories (category_id);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    fingerprint INTEGER,
+    addon_id INTEGER,
+    file_id INTEGER,
+    PRIMARY KEY (fingerprint, file_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    game_id INTEGER,
+    slug TEXT,
+    parent_id INTEGER,
+    modified_at TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS categories_game ON categories (game_id);
+'''
+
+# Bumped whenever stored rows change shape; version 1 held pickled models, version 2 the raw API JSON
+_VERSION = 2
+
+_ORDER = {
+    'popularity': 'a.popularity DESC',
+    'downloads': 'a.download_count DESC',
+    'modified': 'a.modified_at DESC',
+    'name': 'a.name',
+}
+
+# search_addons sort value for "last updated"
+_SORT_LAST_UPDATED = 2
+
+
+def _timestamp(date: Union[datetime, str, None]) -> Optional[str]:
+    if date is None:
+        return None
+    if isinstance(date, str):
+        date = iso_8601_to_datetime(date)
+    return date.isoformat(timespec='microseconds')
+
+
+class AddonIndex:
+
+    def __init__(self, path: str, cf: CurseForge, model_cache_size: int = 10000, serialise_date: bool = True):
+        self._cf = cf
+        self.serialise_date = serialise_date
+        self.db = sqlite3.connect(path)
+        if self.db.execute('PRAGMA user_version').fetchone()[0] != _VERSION:
+            # Older layouts are a cache of the API, so they are rebuilt rather than migrated
+            self.db.executescript('DROP TABLE IF EXISTS addons; DROP TABLE IF EXISTS addon_versions; '
+                                  'DROP TABLE IF EXISTS addon_categories; DROP TABLE IF EXISTS fingerprints; '
+                                  'DROP TABLE IF EXISTS categories;')
+            self.db.execute(f'PRAGMA user_version = {_VERSION}')
+        self.db.executescript(_SCHEMA)
+        self.__models = MemoryCache(model_cache_size)
+
+    def close(self):
+        self.db.close()
+
+    def __load(self, addon_id: int, data: bytes) -> Addon:
+        entry = self.__models.get(addon_id)
+        if entry is not None:
+            return entry.value
+        # Rows hold the payload as the API sent it, so fields decode lazily on first access
+        addon = Addon(self._cf.json_loads(data), self.serialise_date, self._cf, True)
+        self.__models.set(addon_id, addon, float('inf'))
+        return addon
+
+    def add_addons(self, addons: Iterable[Addon]) -> int:
+        updated = 0
+        with self.db:
+            for addon in addons:
+                modified = _timestamp(addon.modified_at)
+                row = self.db.execute('SELECT modified_at FROM addons WHERE id = ?', (addon.id,)).fetchone()
+                if row is not None and row[0] is not None and modified is not None and row[0] >= modified:
+                    continue
+                self.db.execute('INSERT OR REPLACE INTO addons VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                (addon.id, addon.game_id, addon.slug, addon.name, addon.primary_category_id,
+                                 addon.popularity, addon.download_count, modified, json.dumps(addon.to_json())))
+                for table in ('addon_versions', 'addon_categories'):
+                    self.db.execute(f'DELETE FROM {table} WHERE addon_id = ?', (addon.id,))
+                self.db.executemany('INSERT OR IGNORE INTO addon_versions VALUES (?, ?, ?, ?)',
+                                    ((addon.id, f.version, f.mod_loader, f.file_id)
+                                     for f in addon.game_version_latest_files))
+                self.db.executemany('INSERT OR IGNORE INTO addon_categories VALUES (?, ?)',
+                                    ((addon.id, c.id) for c in addon.categories))
+                self.__add_fingerprints(addon.id, addon.latest_files)
+                self.__models.delete(addon.id)
+                updated += 1
+        return updated
+
+    def add_files(self, addon_id: int, files: Iterable[AddonFile]):
+        with self.db:
+            self.__add_fingerprints(addon_id, files)
+
+    def __add_fingerprints(self, addon_id: int, files: Iterable[AddonFile]):
+        self.db.executemany('INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?)',
+                            ((int(f.package_fingerprint), addon_id, f.id) for f in files
+                             if f.package_fingerprint is not None))
+
+    def add_categories(self, categories: Iterable[Category]):
+        with self.db:
+            self.db.executemany('INSERT OR REPLACE INTO categories VALUES (?, ?, ?, ?, ?, ?)',
+                                ((c.id, c.game_id, c.slug, c.parent_id, _timestamp(c.modified_at),
+                                  json.dumps(c.to_json())) for c in categories))
+
+    def last_modified(self, game_id: int) -> Optional[str]:
+        return self.db.execute('SELECT MAX(modified_at) FROM addons WHERE game_id = ?', (game_id,)).fetchone()[0]
+
+    async def refresh(self, game_id: int, page_size: int = 50, **search) -> int:
+        # Walk the catalogue newest-first and stop at the first addon the index already has
+        watermark = self.last_modified(game_id)
+        batch = []
+        addons = self._cf.iter_search_addons(game_id, sort=_SORT_LAST_UPDATED, page_size=page_size, **search)
+        try:
+            async for addon in addons:
+                if watermark is not None and _timestamp(addon.modified_at) <= watermark:
+                    break
+                batch.append(addon)
+        finally:
+            # Cancels the pages still being prefetched
+            await addons.aclose()
+        return self.add_addons(batch)
+
+    def get(self, addon_id: int) -> Optional[Addon]:
+        row = self.db.execute('SELECT id, data FROM addons WHERE id = ?', (addon_id,)).fetchone()
+        return self.__load(*row) if row else None
+
+    def by_slug(self, slug: str, game_id: int = None) -> Optional[Addon]:
+        sql = 'SELECT id, data FROM addons WHERE slug = ?'
+        args = [slug]
+        if game_id is not None:
+            sql += ' AND game_id = ?'
+            args.append(game_id)
+        row = self.db.execute(sql, args).fetchone()
+        return self.__load(*row) if row else None
+
+    def by_fingerprint(self, fingerprint: int) -> List[Tuple[Addon, int]]:
+        rows = self.db.execute('SELECT a.id, a.data, f.file_id FROM fingerprints f JOIN addons a ON a.id = f.addon_id '
+                               'WHERE f.fingerprint = ?', (fingerprint,)).fetchall()
+        return [(self.__load(addon_id, data), file_id) for addon_id, data, file_id in rows]
+
+    def query(self, game_id: int = None, game_version: str = None, mod_loader: int = None, category_id: int = None,
+              name: str = None, order_by: str = 'popularity', limit: int = None, offset: int = 0) -> List[Addon]:
+        sql = 'SELECT a.id, a.data FROM addons a'
+        where = []
+        args = []
+        if game_version is not None or mod_loader is not None:
+            sql += ' JOIN (SELECT DISTINCT addon_id FROM addon_versions WHERE 1'
+            if game_version is not None:
+                sql += ' AND game_version = ?'
+                args.append(game_version)
+            if mod_loader is not None:
+                sql += ' AND mod_loader = ?'
+                args.append(int(mod_loader))
+            sql += ') v ON v.addon_id = a.id'
+        if category_id is not None:
+            sql += ' JOIN addon_categories c ON c.addon_id = a.id AND c.category_id = ?'
+            args.append(category_id)
+        if game_id is not None:
+            where.append('a.game_id = ?')
+            args.append(game_id)
+        if name:
+            where.append('a.name LIKE ?')
+            args.append(f'%{name}%')
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY ' + _ORDER[order_by]
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            args += [limit, offset]
+        return [self.__load(addon_id, data) for addon_id, data in self.db.execute(sql, args)]
+
+    def categories(self, game_id: int = None) -> List[Category]:
+        if game_id is None:
+            rows = self.db.execute('SELECT data FROM categories')
+        else:
+            rows = self.db.execute('SELECT data FROM categories WHERE game_id = ?', (game_id,))
+        return [Category(self._cf.json_loads(data), self.serialise_date, self._cf, True) for data, in rows]
@@ -0,0 +1,187 @@
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1 << 10, 1 << 12, 1 << 14, 1 << 16, 1 << 18, 1 << 20, 1 << 22, 1 << 24)
+
+
+@lru_cache(4096)
+def endpoint(path: str) -> str:
+    # Ids and versions are folded so every addon/{id} request lands in the same series
+    path = path.split('?', 1)[0].rstrip('/')
+    return '/'.join('{id}' if any(c.isdigit() for c in segment) else segment for segment in path.split('/'))
+
+
+class RequestEvent:
+    __slots__ = ('method', 'path', 'start', 'elapsed', 'status', 'attempts', 'size', 'network', 'decode', 'build',
+                 'cached', 'revalidated', 'error')
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.start: float = time.perf_counter()
+        self.elapsed: Optional[float] = None
+        self.status: Optional[int] = None
+        self.attempts: int = 0
+        self.size: Optional[int] = None
+        self.network: Optional[float] = None
+        self.decode: Optional[float] = None
+        self.build: Optional[float] = None
+        self.cached: bool = False
+        self.revalidated: bool = False
+        self.error: Optional[BaseException] = None
+
+    @property
+    def endpoint(self) -> str:
+        return endpoint(self.path)
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - 1, 0)
+
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Iterable[float]):
+        self.bounds: Tuple[float, ...] = tuple(bounds)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.sum: float = 0
+        self.count: int = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        total = 0
+        buckets = []
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+    def quantile(self, q: float) -> Optional[float]:
+        # Upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+
+class EndpointMetrics:
+    __slots__ = ('requests', 'errors', 'retries', 'cache_hits', 'revalidations', 'statuses',
+                 'latency', 'network', 'decode', 'build', 'size')
+
+    def __init__(self, latency_buckets: Iterable[float], size_buckets: Iterable[float]):
+        self.requests: int = 0
+        self.errors: int = 0
+        self.retries: int = 0
+        self.cache_hits: int = 0
+        self.revalidations: int = 0
+        self.statuses: Dict[int, int] = {}
+        self.latency = Histogram(latency_buckets)
+        self.network = Histogram(latency_buckets)
+        self.decode = Histogram(latency_buckets)
+        self.build = Histogram(latency_buckets)
+        self.size = Histogram(size_buckets)
+
+    @property
+    def cache_hit_rate(self) -> float:
+        return self.cache_hits / self.requests if self.requests else 0.0
+
+
+class Metrics:
+
+    def __init__(self, latency_buckets: Iterable[float] = LATENCY_BUCKETS, size_buckets: Iterable[float] = SIZE_BUCKETS):
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self.started: float = time.monotonic()
+
+    def attach(self, cf):
+        cf.on_request_end(self.record)
+        return self
+
+    def record(self, event: RequestEvent):
+        key = (event.method, event.endpoint)
+        m = self.endpoints.get(key)
+        if m is None:
+            m = self.endpoints[key] = EndpointMetrics(self.latency_buckets, self.size_buckets)
+        m.requests += 1
+        if event.cached:
+            m.cache_hits += 1
+            return
+        if event.revalidated:
+            m.revalidations += 1
+        if event.error is not None or event.status is not None and event.status >= 400:
+            m.errors += 1
+        if event.status is not None:
+            m.statuses[event.status] = m.statuses.get(event.status, 0) + 1
+        m.retries += event.retries
+        m.latency.observe(event.elapsed)
+        for name in ('network', 'decode', 'build', 'size'):
+            value = getattr(event, name)
+            if value is not None:
+                getattr(m, name).observe(value)
+
+    def throughput(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return sum(m.requests for m in self.endpoints.values()) / elapsed if elapsed else 0.0
+
+    def reset(self):
+        self.endpoints.clear()
+        self.started = time.monotonic()
+
+    def snapshot(self) -> dict:
+        # Plain data for JSON or an OpenTelemetry exporter
+        result = {}
+        for (method, name), m in self.endpoints.items():
+            result[f'{method} {name}'] = {
+                'requests': m.requests,
+                'errors': m.errors,
+                'retries': m.retries,
+                'cache_hits': m.cache_hits,
+                'cache_hit_rate': m.cache_hit_rate,
+                'revalidations': m.revalidations,
+                'statuses': dict(m.statuses),
+                **{h: {'count': getattr(m, h).count, 'sum': getattr(m, h).sum,
+                       'buckets': getattr(m, h).cumulative()}
+                   for h in ('latency', 'network', 'decode', 'build', 'size')},
+            }
+        return result
+
+    def to_prometheus(self, prefix: str = 'curseforge') -> str:
+        lines = []
+        counters = ('requests', 'errors', 'retries', 'cache_hits', 'revalidations')
+        histograms = (('latency', 'seconds'), ('network', 'seconds'), ('decode', 'seconds'), ('build', 'seconds'),
+                      ('size', 'bytes'))
+        for counter in counters:
+            lines.append(f'# TYPE {prefix}_{counter}_total counter')
+            for (method, name), m in self.endpoints.items():
+                lines.append(f'{prefix}_{counter}_total{{method="{method}",endpoint="{name}"}} {getattr(m, counter)}')
+        lines.append(f'# TYPE {prefix}_responses_total counter')
+        for (method, name), m in self.endpoints.items():
+            for status, count in sorted(m.statuses.items()):
+                lines.append(f'{prefix}_responses_total{{method="{method}",endpoint="{name}",status="{status}"}} {count}')
+        for histogram, unit in histograms:
+            metric = f'{prefix}_request_{histogram}_{unit}'
+            lines.append(f'# TYPE {metric} histogram')
+            for (method, name), m in self.endpoints.items():
+                h = getattr(m, histogram)
+                labels = f'method="{method}",endpoint="{name}"'
+                for bound, total in h.cumulative():
+                    le = '+Inf' if bound == float('inf') else str(bound)
+                    lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {total}')
+                lines.append(f'{metric}_sum{{{labels}}} {h.sum}')
+                lines.append(f'{metric}_count{{{labels}}} {h.count}')
+        return '\n'.join(lines) + '\n'
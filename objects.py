@@ -1,145 +1,151 @@
 import json
-from collections import Iterable
 from datetime import datetime
-from enum import IntEnum
-from typing import Optional, Union, List
+from functools import lru_cache
+from enum import Enum, IntEnum
+from types import MappingProxyType
+from typing import Iterable, Optional, Union, List
 
 
+@lru_cache(maxsize=8192)
 def iso_8601_to_datetime(date: str) -> datetime:
+    # Fast path for the two shapes CurseForge sends: 2021-04-28T06:35:22Z and 2021-04-28T06:35:22.14Z
+    if len(date) >= 20 and date[-1] == 'Z' and date[19] in '.Z' and date[10] == 'T':
+        try:
+            return datetime(int(date[:4]), int(date[5:7]), int(date[8:10]), int(date[11:13]), int(date[14:16]),
+                            int(date[17:19]), int(date[20:-1][:6].ljust(6, '0')) if len(date) > 21 else 0)
+        except ValueError:
+            pass
     try:
-        return datetime.strptime(date, f'%Y-%m-%dT%H:%M:%S.%fZ')
+        return datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%fZ')
     except ValueError:
-        return datetime.strptime(date, f'%Y-%m-%dT%H:%M:%SZ')
+        return datetime.strptime(date, '%Y-%m-%dT%H:%M:%SZ')
 
 
-class AddonFile:
+def _freeze(v):
+    # Models are shared between callers, so JSON containers are handed out as read-only tuples and mappings
+    if isinstance(v, list):
+        return tuple(_freeze(e) for e in v)
+    if isinstance(v, dict):
+        return MappingProxyType({k: _freeze(e) for k, e in v.items()})
+    return v
 
-    def __init__(self, j: dict, serialise_date, cf):
-        self._cf = cf
-        self.id: int = j['id']
-        self.display_name: str = j['displayName']
-        self.file_name: str = j['fileName']
-        if serialise_date:
-            self.uploaded_at: datetime = iso_8601_to_datetime(j['fileDate'])
-            self.released_at: datetime = iso_8601_to_datetime(j['gameVersionDateReleased'])
-        else:
-            self.uploaded_at: str = j['fileDate']
-            self.released_at: str = j['gameVersionReleaseDate']
-        self.size: int = j['fileLength']
-        self.release_type: ReleaseType = ReleaseType(j['releaseType'])
-        self.file_status: FileStatus = FileStatus(j['fileStatus'])
-        self.download_url: str = j['downloadUrl']
-        self.alternate: bool = j['isAlternate']
-        self.alternate_file_id: int = j['alternateFileId']
-        self.dependencies: Iterable[int] = map(lambda d: d['id'], j['dependencies'])
-        self.available: bool = j['isAvailable']
-        self.modules: Iterable[Module] = map(lambda m: Module(m), j['modules'])
-        self.package_fingerprint: str = j['packageFingerprint']
-        self.game_versions: [str] = j['gameVersion']
-        self.install_metadata: Optional[str] = j.get('installMetadata')
-        self.changelog: Optional[str] = j.get('changelog')
-        self.has_install_script: bool = j['hasInstallScript']
-        self.game_version_flavor: Optional[int] = j.get('gameVersionFlavor')
-
-
-class Addon:
-
-    def __init__(self, j: dict, serialise_date, cf):
-        self._cf = cf
-        self._serialise = serialise_date
-        self.id: int = j['id']
-        self.name: str = j['name']
-        self.authors: Iterable[Author] = map(lambda a: Author(a), j['authors'])
-        self.attachments: Iterable[Attachment] = map(lambda a: Attachment(a), j['attachments'])
-        self.website_url: str = j['websiteUrl']
-        self.game_id: int = j['gameId']
-        self.summary: str = j['summary']
-        self.default_file_id: int = j['defaultFileId']
-        self.download_count: int = j['downloadCount']
-        self.latest_files: Iterable[AddonFile] = map(lambda f: AddonFile(f, serialise_date, cf), j['latestFiles'])
-        self.status: AddonStatus = AddonStatus(j['status'])
-        self.primary_category_id: int = j['primaryCategoryId']
-        self.categories: Iterable[GameCategory] = map(lambda c: GameCategory(c), j['categories'])
-        self.category_section: CategorySection = CategorySection(j['categorySection'])
-        self.slug: str = j['slug']
-        self.game_version_latest_files: Iterable[GameVersionLatestFile] = map(
-            lambda f: GameVersionLatestFile(f), j['gameVersionLatestFiles'])
-        self.featured: bool = j['isFeatured']
-        self.popularity: float = j['popularityScore']
-        self.game_popularity_rank: int = j['gamePopularityRank']
-        self.primary_language: str = j['primaryLanguage']
-        self.game_slug: str = j['gameSlug']
-        self.game_name: str = j['gameName']
-        self.portal: str = j['portalName']
-        if serialise_date:
-            self.modified_at: datetime = iso_8601_to_datetime(j['dateModified'])
-            self.created_at: datetime = iso_8601_to_datetime(j['dateCreated'])
-            self.released_at: datetime = iso_8601_to_datetime(j['dateReleased'])
-        else:
-            self.modified_at: str = j['dateModified']
-            self.created_at: str = j['dateCreated']
-            self.released_at: str = j['dateReleased']
-        self.available: bool = j['isAvailable']
-        self.experimental: bool = j['isExperiemental']  # Lmao this is actually their typo
 
-    async def get_description(self) -> str:
-        return await self._cf.get_addon_description(self.id)
+def _thaw(v):
+    # The inverse of _freeze, which also deep-copies plain JSON
+    if isinstance(v, (list, tuple)):
+        return [_thaw(e) for e in v]
+    if isinstance(v, (dict, MappingProxyType)):
+        return {k: _thaw(e) for k, e in v.items()}
+    return v
 
-    async def get_files(self) -> Iterable[AddonFile]:
-        return await self._cf.get_addon_files(self.id, self._serialise)
 
-    async def get_file(self, file_id) -> AddonFile:
-        return await self._cf.get_addon_file(self.id, file_id, self._serialise)
+# Converters carry an `encode` inverse so to_json can rebuild the payload; fields without one are derived views
+def _date(m, v):
+    return iso_8601_to_datetime(v) if m._serialise else v
 
 
-class Author:
+_date.encode = lambda v: v if isinstance(v, str) else v.isoformat(timespec='microseconds') + 'Z'
 
-    def __init__(self, j: dict):
-        self.name: str = j['name']
-        self.url: str = j['url']
-        self.addon_id: int = j['projectId']
-        self.id: int = j['id']
-        self.addon_title_id: dict = j['projectTitleId']
-        self.addon_title_title: dict = j['projectTitleTitle']  # #BestKeyNameEver
-        self.user_id: int = j['userId']
-        self.twitch_id: int = j['twitchId']
 
+def _json(m, v):
+    return _freeze(json.loads(v)) if v else None
 
-class Attachment:
 
-    def __init__(self, j: dict):
-        self.id: int = j['id']
-        self.addon_id: int = j['projectId']
-        self.description: str = j['description']
-        self.default: bool = j['isDefault']
-        self.thumbnail_url: str = j['thumbnailUrl']
-        self.title: str = j['title']
-        self.url: str = j['url']
-        self.status: int = j['status']
+_json.encode = lambda v: json.dumps(_thaw(v))
 
 
-class AddonFileDetails(AddonFile):
+def _converter(decode, encode):
+    decode.encode = encode
+    return decode
+
+
+def _convert(t):
+    return _converter(lambda m, v: t(v), lambda v: v.value if isinstance(v, Enum) else v)
+
+
+def _one(t):
+    return _converter(lambda m, v: t(v, m._serialise, m._cf, m._lazy), lambda v: v.to_json())
+
+
+def _many(t):
+    return _converter(lambda m, v: tuple(t(e, m._serialise, m._cf, m._lazy) for e in v),
+                      lambda v: [e.to_json() for e in v])
+
+
+class _ModelMeta(type):
+    # Model classes by name, so stored payloads can name their type without pickling it
+    registry = {}
+
+    def __new__(mcs, name, bases, ns):
+        fields = {}
+        for base in reversed(bases):
+            fields.update(getattr(base, '_fields', {}))
+        own = {k: (v, None) if isinstance(v, str) else v for k, v in ns.items()
+               if not k.startswith('_') and isinstance(v, (str, tuple))}
+        for k in own:
+            del ns[k]
+        ns.setdefault('__slots__', tuple(k for k in own if k not in fields))
+        fields.update(own)
+        ns['_fields'] = fields
+        cls = super().__new__(mcs, name, bases, ns)
+        mcs.registry[name] = cls
+        return cls
+
+
+class _Model(metaclass=_ModelMeta):
+    # Fields are class attributes holding the JSON key or a (key, converter) pair, stored in __slots__.
+    # Lazy models keep the raw dict and decode each field on first access instead of in __init__.
+    # Models are read-only once built, since coalesced requests and the cache hand the same object to every caller.
+    __slots__ = ('_cf', '_serialise', '_lazy', '_j')
 
-    def __init__(self, j, serialise_date, cf):
-        super().__init__(j, serialise_date, cf)
-        self.game_versions: map = map(lambda v: GameVersion(v, serialise_date), j['sortableGameVersion'])
-        self.compatible_with_client: bool = j['isCompatibleWithClient']
-        self.category_section_package_type: int = j['categorySectionPackageType']
-        self.restrict_addon_file_access: int = j['restrictProjectFileAccess']
-        self.addon_status: AddonStatus = AddonStatus(j['projectStatus'])
-        self.render_cache_id: int = j['renderCacheId']
-        self.legacy_mapping_id: Optional[int] = j.get('fileLegacyMappingId')
-        self.addon_id: int = j['projectId']
-        self.parent_addon_file_id: Optional[int] = j.get('parentProjectFileId')
-        self.parent_file_legacy_mapping_id: Optional[int] = j.get('parentFileLegacyMappingId')
-        self.file_type_id: Optional[int] = j.get('fileTypeId')
-        self.expose_as_alternative: Optional[float, int] = j.get('exposeAsAlternative')  # Float/Int?
-        self.package_fingerprint_id: int = j['packageFingerprintId']
-        self.game_id: int = j['gameId']
-        self.server_pack: bool = j['isServerPack']
-        self.server_pack_file_id: Optional[int] = j.get('serverPackFileId')
-        self.game_version_mapping_id: int = j['gameVersionMappingId']
-        self.game_version_id: int = j['gameVersionId']
+    def __init__(self, j: dict, serialise_date: bool = True, cf=None, lazy: bool = False):
+        set_ = object.__setattr__
+        set_(self, '_cf', cf)
+        set_(self, '_serialise', serialise_date)
+        set_(self, '_lazy', lazy)
+        if lazy:
+            set_(self, '_j', j)
+        else:
+            for name, (key, conv) in self._fields.items():
+                set_(self, name, self._decode(j, key, conv))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'{type(self).__name__}' object is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"'{type(self).__name__}' object is read-only")
+
+    def __reduce__(self):
+        return type(self), (self.to_json(), self._serialise, self._cf, self._lazy)
+
+    def to_json(self) -> dict:
+        # Always a fresh copy, since the lazy payload is shared by everyone holding this model
+        if self._lazy:
+            return _thaw(self._j)
+        j = {}
+        for name, (key, conv) in self._fields.items():
+            v = getattr(self, name)
+            if conv is None:
+                j[key] = _thaw(v)
+            elif hasattr(conv, 'encode'):
+                j[key] = None if v is None else conv.encode(v)
+        return j
+
+    def _decode(self, j: dict, key: str, conv):
+        v = j.get(key)
+        if v is None:
+            return None
+        if conv is None:
+            return _freeze(v) if isinstance(v, (list, dict)) else v
+        return conv(self, v)
+
+    def __getattr__(self, name):
+        field = self._fields.get(name)
+        if field is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        v = self._decode(self._j, *field)
+        object.__setattr__(self, name, v)
+        return v
 
 
 class ReleaseType(IntEnum):
@@ -179,227 +185,311 @@ class AddonStatus(IntEnum):
     UNDER_REVIEW = 10
 
 
-class __BaseCategory:
+class DependencyType(IntEnum):
+    EMBEDDED_LIBRARY = 1
+    OPTIONAL = 2
+    REQUIRED = 3
+    TOOL = 4
+    INCOMPATIBLE = 5
+    INCLUDE = 6
 
-    def __init__(self, j: dict):
-        self.id: int = j['id']
-        self.name: str = j['name']
-        self.avatar_url: str = j['avatarUrl']
-        self.parent_id: int = j['parentId']
-        self.root_id: int = j['rootId']
-        self.game_id: int = j['gameId']
 
+class ModLoaderType(IntEnum):
+    ANY = 0
+    FORGE = 1
+    CAULDRON = 2
+    LITE_LOADER = 3
+    FABRIC = 4
 
-class GameCategory(__BaseCategory):
 
-    def __init__(self, j: dict):
-        j['id'] = j.pop('categoryId')
-        super().__init__(j)
-        self.url: str = j['url']
-        self.addon_id: int = j['projectId']
-        self.avatar_id: int = j['avatarId']
+class Author(_Model):
+    name: str = 'name'
+    url: str = 'url'
+    addon_id: int = 'projectId'
+    id: int = 'id'
+    addon_title_id: dict = 'projectTitleId'
+    addon_title_title: dict = 'projectTitleTitle'  # #BestKeyNameEver
+    user_id: int = 'userId'
+    twitch_id: int = 'twitchId'
 
 
-class Category(__BaseCategory):
-
-    def __init__(self, j: dict, serialise_date, cf):
-        j['parentId'] = j.pop('parentGameCategoryId')
-        j['rootId'] = j.pop('rootGameCategoryId')
-        super().__init__(j)
-        self.slug: str = j['slug']
-        if serialise_date:
-            self.modified_at: datetime = iso_8601_to_datetime(j['dateModified'])
-        else:
-            self.modified_at: str = j['dateModified']
+class Attachment(_Model):
+    id: int = 'id'
+    addon_id: int = 'projectId'
+    description: str = 'description'
+    default: bool = 'isDefault'
+    thumbnail_url: str = 'thumbnailUrl'
+    title: str = 'title'
+    url: str = 'url'
+    status: int = 'status'
 
 
-class CategorySection:
+class Module(_Model):
+    folder: str = 'folderName'
+    fingerprint: str = 'fingerprint', _convert(str)
+    type: int = 'type'
 
-    def __init__(self, j: dict):
-        self.id: int = j['id']
-        self.game_id: int = j['gameId']
-        self.name: str = j['name']
-        self.package_type: int = j['packageType']
-        self.path: str = j['path']
-        self.initial_inclusion_pattern: str = j['initialInclusionPattern']
-        self.extra_include_pattern: Optional[str] = j.get('extraIncludePattern')
-        self.game_category_id: int = j['gameCategoryId']
 
+class Dependency(_Model):
+    id: int = 'id'
+    addon_id: int = 'addonId'
+    type: DependencyType = 'type', _convert(DependencyType)
+    file_id: int = 'fileId'
 
-class GameVersionLatestFile:
 
-    def __init__(self, j: dict):
-        self.version: str = j['gameVersion']
-        self.file_id: int = j['projectFileId']
-        self.file_name: str = j['projectFileName']
-        self.file_type: int = j['fileType']
-        self.version_flavor: Optional[str] = j.get('gameVersionFlavor')
+class GameVersion(_Model):
+    version: str = 'gameVersion'
+    released_at: datetime = 'gameVersionReleaseDate', _date
+    version_padded: str = 'gameVersionPadded'
+    name: str = 'gameVersionName'
 
 
-class Game:
+class GameVersionLatestFile(_Model):
+    version: str = 'gameVersion'
+    file_id: int = 'projectFileId'
+    file_name: str = 'projectFileName'
+    file_type: int = 'fileType'
+    version_flavor: Optional[str] = 'gameVersionFlavor'
+    mod_loader: Optional[int] = 'modLoader'
 
-    def __init__(self, j, serialise_date, cf):
-        self.id: int = j['id']
-        self.name: str = j['name']
-        self.slug: str = j['slug']
-        if serialise_date:
-            self.modified_at: datetime = iso_8601_to_datetime(j['dateModified'])
-        else:
-            self.modified_at: str = j['dateModified']
-        self.game_files: Iterable[GameFile] = map(lambda f: GameFile(f), j['gameFiles'])
-        self.game_detection_hints: Iterable[GameDetectionHint] = map(
-            lambda h: GameDetectionHint(h), j['gameDetectionHints'])
-        self.file_parsing_rules: Iterable[FileParsingRule] = map(lambda r: FileParsingRule(r), j['fileParsingRules'])
-        self.category_sections: Iterable[CategorySection] = map(lambda s: CategorySection(s), j['categorySections'])
-        self.max_free_storage: Union[float, int] = j['maxFreeStorage']  # float / int?
-        self.max_premium_storage: Union[float, int] = j['maxPremiumStorage']  # float / int?
-        self.max_file_size: Union[float, int] = j['maxFileSize']  # float / int?
-        self.addon_settings_folder_filter: Optional[str] = j['addonSettingsFolderFilter']
-        self.addon_settings_starting_folder: Optional[str] = j['addonSettingsStartingFolder']
-        self.addon_settings_file_filter: Optional[str] = j['addonSettingsFileFilter']
-        self.addon_settings_file_removal_filter: Optional[str] = j['addonSettingsFileRemovalFilter']
-        self.support_addons: bool = j['supportsAddons']
-        self.support_partner_addons: bool = j['supportsPartnerAddons']
-        self.supported_client_config: int = j['supportedClientConfiguration']
-        self.support_notifications: bool = j['supportsNotifications']
-        self.profiler_addon_id: int = j['profilerAddonId']
-        self.twitch_game_id: int = j['twitchGameId']
-        self.client_game_settings_id: int = j['clientGameSettingsId']
-
-
-class GameFile:
-
-    def __init__(self, j):
-        self.id: int = j['id']
-        self.game_id: int = j['gameId']
-        self.required: bool = j['isRequired']
-        self.file_name: str = j['fileName']
-        self.file_type: int = j['fileType']
-        self.platform_type: int = j['platformType']
-
-
-class GameDetectionHint:
-
-    def __init__(self, j):
-        self.id: int = j['id']
-        self.hint_type: int = j['hintType']
-        self.hint_path: str = j['hintPath']
-        self.hint_key = j['hintKey']
-        self.hint_options: int = j['hintOptions']
-        self.game_id: int = j['gameId']
-
-
-class FileParsingRule:
-
-    def __init__(self, j):
-        self.id: int = j['id']
-        self.comment_strip_pattern: str = j['commentStripPattern']
-        self.extension: str = j['fileExtension']
-        self.inclusion_pattern: str = j['inclusionPattern']
-        self.game_id: int = j['gameId']
-
-
-class Module:
-
-    def __init__(self, j):
-        self.folder: str = j['folderName']
-        self.fingerprint: str = str(j['fingerprint'])
-        self.type: int = j['type']
-
-
-class GameVersion:
-
-    def __init__(self, j, serialise_date):
-        self.version = j['gameVersion']
-        if serialise_date:
-            self.released_at: datetime = iso_8601_to_datetime(j['gameVersionReleaseDate'])
-        else:
-            self.released_at: str = j['gameVersionReleaseDate']
-        self.version_padded: str = j['gameVersionPadded']
-        self.name: str = j['gameVersionName']
 
+class __BaseCategory(_Model):
+    id: int = 'id'
+    name: str = 'name'
+    avatar_url: str = 'avatarUrl'
+    parent_id: int = 'parentId'
+    root_id: int = 'rootId'
+    game_id: int = 'gameId'
 
-class FingerprintMatch:
 
-    def __init__(self, j: dict, serialise_date, cf):
-        self.id: int = j['id']
-        self.file: AddonFileDetails = AddonFileDetails(j['file'], serialise_date, cf)
-        self.latest_files: Iterable[AddonFileDetails] = map(
-            lambda d: AddonFileDetails(d, serialise_date, cf), j['latestFiles'])
+class GameCategory(__BaseCategory):
+    id: int = 'categoryId'
+    url: str = 'url'
+    addon_id: int = 'projectId'
+    avatar_id: int = 'avatarId'
 
 
-class FingerprintResponse:
+class Category(__BaseCategory):
+    parent_id: int = 'parentGameCategoryId'
+    root_id: int = 'rootGameCategoryId'
+    slug: str = 'slug'
+    modified_at: datetime = 'dateModified', _date
+
+
+class CategorySection(_Model):
+    id: int = 'id'
+    game_id: int = 'gameId'
+    name: str = 'name'
+    package_type: int = 'packageType'
+    path: str = 'path'
+    initial_inclusion_pattern: str = 'initialInclusionPattern'
+    extra_include_pattern: Optional[str] = 'extraIncludePattern'
+    game_category_id: int = 'gameCategoryId'
+
+
+class AddonFile(_Model):
+    id: int = 'id'
+    display_name: str = 'displayName'
+    file_name: str = 'fileName'
+    uploaded_at: datetime = 'fileDate', _date
+    released_at: datetime = 'gameVersionDateReleased', _date
+    size: int = 'fileLength'
+    release_type: ReleaseType = 'releaseType', _convert(ReleaseType)
+    file_status: FileStatus = 'fileStatus', _convert(FileStatus)
+    download_url: str = 'downloadUrl'
+    alternate: bool = 'isAlternate'
+    alternate_file_id: int = 'alternateFileId'
+    dependencies: Iterable[int] = 'dependencies', lambda m, v: tuple(d['id'] for d in v)
+    dependency_details: Iterable[Dependency] = 'dependencies', _many(Dependency)
+    available: bool = 'isAvailable'
+    modules: Iterable[Module] = 'modules', _many(Module)
+    package_fingerprint: str = 'packageFingerprint'
+    game_versions: List[str] = 'gameVersion'
+    install_metadata: Optional[str] = 'installMetadata'
+    changelog: Optional[str] = 'changelog'
+    has_install_script: bool = 'hasInstallScript'
+    game_version_flavor: Optional[int] = 'gameVersionFlavor'
+
+    def compatible(self, game_version: str, loader: Union[str, ModLoaderType, None] = None,
+                   release_type: ReleaseType = ReleaseType.RELEASE) -> bool:
+        # Files list their loader by name among the game versions, e.g. ['1.16.5', 'Forge']
+        if loader and not isinstance(loader, str):
+            loader = ModLoaderType(loader).name.title().replace('_', '')
+        versions = self.game_versions or ()
+        return self.release_type <= release_type and game_version in versions and (not loader or loader in versions)
 
-    def __init__(self, j: dict, serialise_date, cf):
-        self.cache_built: bool = j['isCacheBuilt']
-        self.exact_matches: Iterable[FingerprintMatch] = map(
-            lambda m: FingerprintMatch(m, serialise_date, cf), j['exactMatches'])
-        self.exact_fingerprints: [int] = j['exactFingerprints']
-        self.partial_matches: Iterable[FingerprintMatch] = map(
-            lambda m: FingerprintMatch(m, serialise_date, cf), j['partialMatches'])
-        self.partial_match_fingerprints: Union[List, {}] = j['partialMatchFingerprints']  # Doc: List, Received Dict
-        self.installed_fingerprints: [int] = j['installedFingerprints']
-        self.unmatched_fingerprints: [int] = j['unmatchedFingerprints']
 
+class AddonFileDetails(AddonFile):
+    game_versions: Iterable[GameVersion] = 'sortableGameVersion', _many(GameVersion)
+    compatible_with_client: bool = 'isCompatibleWithClient'
+    category_section_package_type: int = 'categorySectionPackageType'
+    restrict_addon_file_access: int = 'restrictProjectFileAccess'
+    addon_status: AddonStatus = 'projectStatus', _convert(AddonStatus)
+    render_cache_id: int = 'renderCacheId'
+    legacy_mapping_id: Optional[int] = 'fileLegacyMappingId'
+    addon_id: int = 'projectId'
+    parent_addon_file_id: Optional[int] = 'parentProjectFileId'
+    parent_file_legacy_mapping_id: Optional[int] = 'parentFileLegacyMappingId'
+    file_type_id: Optional[int] = 'fileTypeId'
+    expose_as_alternative: Union[float, int, None] = 'exposeAsAlternative'  # Float/Int?
+    package_fingerprint_id: int = 'packageFingerprintId'
+    game_id: int = 'gameId'
+    server_pack: bool = 'isServerPack'
+    server_pack_file_id: Optional[int] = 'serverPackFileId'
+    game_version_mapping_id: int = 'gameVersionMappingId'
+    game_version_id: int = 'gameVersionId'
+
+
+class Addon(_Model):
+    id: int = 'id'
+    name: str = 'name'
+    authors: Iterable[Author] = 'authors', _many(Author)
+    attachments: Iterable[Attachment] = 'attachments', _many(Attachment)
+    website_url: str = 'websiteUrl'
+    game_id: int = 'gameId'
+    summary: str = 'summary'
+    default_file_id: int = 'defaultFileId'
+    download_count: int = 'downloadCount'
+    latest_files: Iterable[AddonFile] = 'latestFiles', _many(AddonFile)
+    status: AddonStatus = 'status', _convert(AddonStatus)
+    primary_category_id: int = 'primaryCategoryId'
+    categories: Iterable[GameCategory] = 'categories', _many(GameCategory)
+    category_section: CategorySection = 'categorySection', _one(CategorySection)
+    slug: str = 'slug'
+    game_version_latest_files: Iterable[GameVersionLatestFile] = 'gameVersionLatestFiles', _many(
+        GameVersionLatestFile)
+    featured: bool = 'isFeatured'
+    popularity: float = 'popularityScore'
+    game_popularity_rank: int = 'gamePopularityRank'
+    primary_language: str = 'primaryLanguage'
+    game_slug: str = 'gameSlug'
+    game_name: str = 'gameName'
+    portal: str = 'portalName'
+    modified_at: datetime = 'dateModified', _date
+    created_at: datetime = 'dateCreated', _date
+    released_at: datetime = 'dateReleased', _date
+    available: bool = 'isAvailable'
+    experimental: bool = 'isExperiemental'  # Lmao this is actually their typo
 
-class Minecraft:
+    async def get_description(self) -> str:
+        return await self._cf.get_addon_description(self.id)
 
-    def __init__(self, j: dict, serialise_date, cf):
-        self.id: int = j['id']
-        self.version: str = j['versionString']
-        self.version_id: int = j['gameVersionId']
-        self.jar_download_url: str = j['jarDownloadUrl']
-        self.json_download_url: str = j['jsonDownloadUrl']
-        self.approved: bool = j['approved']
-        if serialise_date:
-            self.modified_at: datetime = iso_8601_to_datetime(j['dateModified'])
-        else:
-            self.modified_at: str = j['dateModified']
-        self.version_type_id: int = j['gameVersionTypeId']
-        self.version_status: int = j['gameVersionStatus']
-        self.version_type_status: int = j['gameVersionTypeStatus']
+    async def get_files(self) -> Iterable[AddonFile]:
+        return await self._cf.get_addon_files(self.id, self._serialise)
 
+    async def get_file(self, file_id) -> AddonFile:
+        return await self._cf.get_addon_file(self.id, file_id, self._serialise)
 
-class ModLoader:
 
-    def __init__(self, j: dict, serialise_date, cf):
-        self.name: str = j['name']
-        self.game_version: str = j['gameVersion']
-        self.latest: bool = j['latest']
-        self.recommended: bool = j['recommended']
-        if serialise_date:
-            self.modified_at: datetime = iso_8601_to_datetime(j['dateModified'])
-        else:
-            self.modified_at: str = j['dateModified']
+class GameFile(_Model):
+    id: int = 'id'
+    game_id: int = 'gameId'
+    required: bool = 'isRequired'
+    file_name: str = 'fileName'
+    file_type: int = 'fileType'
+    platform_type: int = 'platformType'
+
+
+class GameDetectionHint(_Model):
+    id: int = 'id'
+    hint_type: int = 'hintType'
+    hint_path: str = 'hintPath'
+    hint_key: str = 'hintKey'
+    hint_options: int = 'hintOptions'
+    game_id: int = 'gameId'
+
+
+class FileParsingRule(_Model):
+    id: int = 'id'
+    comment_strip_pattern: str = 'commentStripPattern'
+    extension: str = 'fileExtension'
+    inclusion_pattern: str = 'inclusionPattern'
+    game_id: int = 'gameId'
+
+
+class Game(_Model):
+    id: int = 'id'
+    name: str = 'name'
+    slug: str = 'slug'
+    modified_at: datetime = 'dateModified', _date
+    game_files: Iterable[GameFile] = 'gameFiles', _many(GameFile)
+    game_detection_hints: Iterable[GameDetectionHint] = 'gameDetectionHints', _many(GameDetectionHint)
+    file_parsing_rules: Iterable[FileParsingRule] = 'fileParsingRules', _many(FileParsingRule)
+    category_sections: Iterable[CategorySection] = 'categorySections', _many(CategorySection)
+    max_free_storage: Union[float, int] = 'maxFreeStorage'  # float / int?
+    max_premium_storage: Union[float, int] = 'maxPremiumStorage'  # float / int?
+    max_file_size: Union[float, int] = 'maxFileSize'  # float / int?
+    addon_settings_folder_filter: Optional[str] = 'addonSettingsFolderFilter'
+    addon_settings_starting_folder: Optional[str] = 'addonSettingsStartingFolder'
+    addon_settings_file_filter: Optional[str] = 'addonSettingsFileFilter'
+    addon_settings_file_removal_filter: Optional[str] = 'addonSettingsFileRemovalFilter'
+    support_addons: bool = 'supportsAddons'
+    support_partner_addons: bool = 'supportsPartnerAddons'
+    supported_client_config: int = 'supportedClientConfiguration'
+    support_notifications: bool = 'supportsNotifications'
+    profiler_addon_id: int = 'profilerAddonId'
+    twitch_game_id: int = 'twitchGameId'
+    client_game_settings_id: int = 'clientGameSettingsId'
+
+
+class FingerprintMatch(_Model):
+    id: int = 'id'
+    file: AddonFileDetails = 'file', _one(AddonFileDetails)
+    latest_files: Iterable[AddonFileDetails] = 'latestFiles', _many(AddonFileDetails)
+
+
+class FingerprintResponse(_Model):
+    cache_built: bool = 'isCacheBuilt'
+    exact_matches: Iterable[FingerprintMatch] = 'exactMatches', _many(FingerprintMatch)
+    exact_fingerprints: List[int] = 'exactFingerprints'
+    partial_matches: Iterable[FingerprintMatch] = 'partialMatches', _many(FingerprintMatch)
+    partial_match_fingerprints: Union[List, dict] = 'partialMatchFingerprints'  # Doc: List, Received Dict
+    installed_fingerprints: List[int] = 'installedFingerprints'
+    unmatched_fingerprints: List[int] = 'unmatchedFingerprints'
+
+
+class Minecraft(_Model):
+    id: int = 'id'
+    version: str = 'versionString'
+    version_id: int = 'gameVersionId'
+    jar_download_url: str = 'jarDownloadUrl'
+    json_download_url: str = 'jsonDownloadUrl'
+    approved: bool = 'approved'
+    modified_at: datetime = 'dateModified', _date
+    version_type_id: int = 'gameVersionTypeId'
+    version_status: int = 'gameVersionStatus'
+    version_type_status: int = 'gameVersionTypeStatus'
+
+
+class ModLoader(_Model):
+    name: str = 'name'
+    game_version: str = 'gameVersion'
+    latest: bool = 'latest'
+    recommended: bool = 'recommended'
+    modified_at: datetime = 'dateModified', _date
 
 
 class ModLoaderDetails(ModLoader):
-
-    def __init__(self, j: dict, serialise_date, cf):
-        j['gameVersion'] = j.pop('minecraftVersion')
-        super().__init__(j, serialise_date, cf)
-        self.id: int = j['id']
-        self.game_version_id: int = j['gameVersionId']
-        self.minecraft_version_id: int = j['minecraftGameVersionId']
-        self.forge_version: str = j['forgeVersion']
-        self.type: int = j['type']
-        self.download_url: str = j['downloadUrl']
-        self.file_name: str = j['filename']
-        self.install_method: int = j['installMethod']
-        self.approved: bool = j['approved']
-        self.maven_version: str = j['mavenVersionString']
-        self.version: dict = json.loads(j['versionJson'])
-        self.libs_install_path: str = j['librariesInstallLocation']
-        if j.get('additionalFilesJson'):
-            self.additional_files: dict = json.loads(j['additionalFilesJson'])
-            self.install_profile: dict = json.loads(j['installProfileJson'])
-        else:
-            self.additional_files = self.install_profile = None
-        self.mod_loader_game_version_id: int = j['modLoaderGameVersionId']
-        self.mod_loader_game_version_type_id: int = j['modLoaderGameVersionTypeId']
-        self.mod_loader_game_version_status: int = j['modLoaderGameVersionStatus']
-        self.mod_loader_game_version_type_status: int = j['modLoaderGameVersionTypeStatus']
-        self.mc_game_version_id: int = j['mcGameVersionId']
-        self.mc_game_version_type_id: int = j['mcGameVersionTypeId']
-        self.mc_game_version_status: int = j['mcGameVersionStatus']
-        self.mc_game_version_type_status: int = j['mcGameVersionTypeStatus']
+    game_version: str = 'minecraftVersion'
+    id: int = 'id'
+    game_version_id: int = 'gameVersionId'
+    minecraft_version_id: int = 'minecraftGameVersionId'
+    forge_version: str = 'forgeVersion'
+    type: int = 'type'
+    download_url: str = 'downloadUrl'
+    file_name: str = 'filename'
+    install_method: int = 'installMethod'
+    approved: bool = 'approved'
+    maven_version: str = 'mavenVersionString'
+    version: dict = 'versionJson', _json
+    libs_install_path: str = 'librariesInstallLocation'
+    additional_files: Optional[dict] = 'additionalFilesJson', _json
+    install_profile: Optional[dict] = 'installProfileJson', _json
+    mod_loader_game_version_id: int = 'modLoaderGameVersionId'
+    mod_loader_game_version_type_id: int = 'modLoaderGameVersionTypeId'
+    mod_loader_game_version_status: int = 'modLoaderGameVersionStatus'
+    mod_loader_game_version_type_status: int = 'modLoaderGameVersionTypeStatus'
+    mc_game_version_id: int = 'mcGameVersionId'
+    mc_game_version_type_id: int = 'mcGameVersionTypeId'
+    mc_game_version_status: int = 'mcGameVersionStatus'
+    mc_game_version_type_status: int = 'mcGameVersionTypeStatus'
@@ -0,0 +1,75 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.capacity: float = burst or max(rate, 1)
+        self.__tokens = self.capacity
+        self.__updated = time.monotonic()
+        self.__lock: Optional[asyncio.Lock] = None
+
+    def __refill(self):
+        now = time.monotonic()
+        self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated) * self.rate)
+        self.__updated = now
+
+    async def acquire(self):
+        # asyncio.Lock wakes waiters in FIFO order, which keeps the queue fair
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+        async with self.__lock:
+            self.__refill()
+            if self.__tokens < 1:
+                await asyncio.sleep((1 - self.__tokens) / self.rate)
+                self.__refill()
+            self.__tokens -= 1
+
+
+class RateLimiter:
+
+    def __init__(self, max_concurrency: int = None, rate: float = None, burst: float = None,
+                 endpoint_rates: Dict[str, float] = None):
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.endpoint_buckets: Dict[str, TokenBucket] = {k: TokenBucket(v) for k, v in (endpoint_rates or {}).items()}
+        self.__slots: Optional[asyncio.Semaphore] = None
+        self.in_flight: int = 0
+
+    def limit(self, path: str) -> '_Limit':
+        return _Limit(self, path.split('/', 1)[0])
+
+    async def acquire(self, family: str):
+        # Tokens come first, so a request waiting on its rate doesn't hold a slot other endpoints could use
+        bucket = self.endpoint_buckets.get(family)
+        if bucket is not None:
+            await bucket.acquire()
+        if self.bucket is not None:
+            await self.bucket.acquire()
+        if self.max_concurrency and self.__slots is None:
+            self.__slots = asyncio.Semaphore(self.max_concurrency)
+        if self.__slots is not None:
+            await self.__slots.acquire()
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        if self.__slots is not None:
+            self.__slots.release()
+
+
+class _Limit:
+    __slots__ = ('limiter', 'family')
+
+    def __init__(self, limiter: RateLimiter, family: str):
+        self.limiter = limiter
+        self.family = family
+
+    async def __aenter__(self):
+        await self.limiter.acquire(self.family)
+
+    async def __aexit__(self, *exc):
+        self.limiter.release()
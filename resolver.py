@@ -0,0 +1,97 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from curseforge import CurseForge
+from objects import Addon, AddonFile, DependencyType, ReleaseType
+
+
+class DependencyCycleError(Exception):
+
+    def __init__(self, cycle: List[int]):
+        super().__init__('Dependency cycle: ' + ' -> '.join(map(str, cycle)))
+        self.cycle = cycle
+
+
+class Resolved:
+    __slots__ = ('addon', 'file', 'dependencies')
+
+    def __init__(self, addon: Addon, file: Optional[AddonFile], dependencies: Tuple[int, ...]):
+        self.addon = addon
+        self.file = file
+        self.dependencies = dependencies
+
+
+class DependencyResolver:
+
+    def __init__(self, cf: CurseForge, game_version: str, loader: str = None,
+                 release_type: ReleaseType = ReleaseType.RELEASE,
+                 follow: Iterable[DependencyType] = (DependencyType.REQUIRED,), chunk_size: int = 500):
+        self._cf = cf
+        self.game_version = game_version
+        self.loader = loader
+        self.release_type = release_type
+        self.follow = frozenset(follow)
+        self.chunk_size = chunk_size
+        self.__nodes: Dict[int, Resolved] = {}
+        self.missing: Set[int] = set()
+
+    def compatible(self, file: AddonFile) -> bool:
+        return file.compatible(self.game_version, self.loader, self.release_type)
+
+    async def pick_file(self, addon: Addon) -> Optional[AddonFile]:
+        files = [f for f in addon.latest_files if self.compatible(f)]
+        if not files:
+            # latest_files only covers recent uploads, older versions need the full listing
+            files = [f for f in await addon.get_files() or () if self.compatible(f)]
+        return max(files, key=lambda f: f.id, default=None)
+
+    def dependencies(self, file: Optional[AddonFile]) -> Tuple[int, ...]:
+        if file is None:
+            return ()
+        # The dependency record's own id is not an addon id, so records without addonId are skipped
+        return tuple(dict.fromkeys(d.addon_id for d in file.dependency_details if d.addon_id and d.type in self.follow))
+
+    async def __fetch(self, addon_ids: List[int]) -> List[Addon]:
+        return list(await self._cf.get_addons(addon_ids, chunk_size=self.chunk_size) or ())
+
+    async def __expand(self, level: Set[int]):
+        # Breadth-first: every level is one round of bulk requests, however many addons it holds
+        while level:
+            addons = await self.__fetch(sorted(level))
+            files = await asyncio.gather(*(self.pick_file(a) for a in addons))
+            self.missing |= level - {a.id for a in addons}
+            next_level = set()
+            for addon, file in zip(addons, files):
+                node = self.__nodes[addon.id] = Resolved(addon, file, self.dependencies(file))
+                next_level.update(node.dependencies)
+            level = next_level - self.__nodes.keys() - self.missing
+
+    def __order(self, roots: Iterable[int]) -> List[Resolved]:
+        plan = []
+        done = set()
+        path = []
+        on_path = set()
+
+        def visit(addon_id: int):
+            if addon_id in done or addon_id not in self.__nodes:
+                return
+            if addon_id in on_path:
+                raise DependencyCycleError(path[path.index(addon_id):] + [addon_id])
+            path.append(addon_id)
+            on_path.add(addon_id)
+            node = self.__nodes[addon_id]
+            for dependency in node.dependencies:
+                visit(dependency)
+            path.pop()
+            on_path.discard(addon_id)
+            done.add(addon_id)
+            plan.append(node)
+
+        for addon_id in roots:
+            visit(addon_id)
+        return plan
+
+    async def resolve(self, addon_ids: Iterable[int]) -> List[Resolved]:
+        roots = list(dict.fromkeys(map(int, addon_ids)))
+        await self.__expand(set(roots) - self.__nodes.keys() - self.missing)
+        return self.__order(roots)
@@ -0,0 +1,85 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple, Type
+
+import aiohttp
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+
+    def __init__(self, attempts: int = 4, base_delay: float = 0.5, max_delay: float = 30,
+                 statuses: Tuple[int, ...] = (429, 500, 502, 503, 504),
+                 exceptions: Tuple[Type[BaseException], ...] = (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = statuses
+        self.exceptions = exceptions
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        # None means give up: out of attempts, or the server asked us to wait longer than max_delay
+        if attempt + 1 >= self.attempts:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        # Full jitter keeps thousands of queued coroutines from retrying in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = self.CLOSED
+        self.failures: int = 0
+        self.__opened_at = 0.0
+        self.__probe_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        # A probe that never reported back is given up on after recovery_time, and another one is let through
+        if self.state == self.OPEN and now - self.__opened_at >= self.recovery_time or \
+                self.state == self.HALF_OPEN and now - self.__probe_at >= self.recovery_time:
+            # Let a single probe through; everyone else keeps failing fast until it reports back
+            self.state = self.HALF_OPEN
+            self.__probe_at = now
+            return True
+        return False
+
+    def success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def abandon(self):
+        # The request ended without telling us anything about the upstream, e.g. it was cancelled
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+            self.__opened_at = time.monotonic() - self.recovery_time
+
+    def failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.__opened_at = time.monotonic()
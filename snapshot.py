@@ -0,0 +1,56 @@
+import os
+import time
+from typing import Any
+
+from curseforge import CurseForge
+
+# Version 2 stores JSON; version 1 files were pickles and are refused rather than unpickled
+MAGIC = b'PCFSNAP\x02'
+
+_FINGERPRINT = ('POST', 'fingerprint')
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def dump_snapshot(cf: CurseForge, path: str, models: Any = None, include_cache: bool = True):
+    # Cache entries keep their remaining TTL; the wall clock at save time lets load() age them across restarts
+    entries = []
+    if include_cache:
+        now = time.monotonic()
+        caches = dict.fromkeys(c for c in (cf.cache, cf.fingerprint_cache) if c is not None)
+        entries = [(key, e.value, e.expires - now, e.etag, e.last_modified) for cache in caches
+                   for key, e in cache.items() if e.expires > now or e.revalidatable]
+    data = CurseForge.dump_models((time.time(), models, entries))
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def load_snapshot(cf: CurseForge, path: str, restore_cache: bool = True) -> Any:
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise SnapshotError(f'{path} is not a snapshot')
+        data = f.read()
+    try:
+        # Models come back lazy, so a restore doesn't re-parse dates and nested payloads nobody reads
+        saved_at, models, entries = cf.load_models(data, lazy=True)
+        age = max(time.time() - saved_at, 0)
+        restored = []
+        for key, value, ttl, etag, last_modified in entries if restore_cache else ():
+            # Keys go straight back into a cache, so they have to be hashable
+            hash(key)
+            restored.append((key, value, ttl - age, etag, last_modified))
+    except (ValueError, TypeError, IndexError, KeyError, AttributeError, RecursionError) as e:
+        # Anything the file's structure gets wrong surfaces here, not just unparseable JSON
+        raise SnapshotError(f'{path} is corrupt: {e}') from e
+    for key, value, ttl, etag, last_modified in restored:
+        # Fingerprint matches live in their own store, everything else in the main cache
+        cache = cf.fingerprint_cache if isinstance(key, tuple) and key[:2] == _FINGERPRINT else cf.cache
+        # Expired entries only come back when a conditional request can revalidate them
+        if cache is not None and (ttl > 0 or etag is not None or last_modified is not None):
+            cache.set(key, value, ttl, etag, last_modified)
+    return models
@@ -0,0 +1,25 @@
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+
+from aiohttp import web
+
+
+def run(test):
+    # Runs an async test on a fresh event loop, so the suite needs no asyncio plugin
+    @functools.wraps(test)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(test(*args, **kwargs))
+    return wrapper
+
+
+@asynccontextmanager
+async def serve(app: web.Application):
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    try:
+        yield f'http://127.0.0.1:{runner.addresses[0][1]}/'
+    finally:
+        await runner.cleanup()
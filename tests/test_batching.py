@@ -0,0 +1,94 @@
+import asyncio
+
+from aiohttp import web
+
+from cache import MemoryCache
+from curseforge import AddonNotFoundError, CurseForge, CurseForgeException
+from tests.helpers import run, serve
+
+
+def make_app():
+    batches = []
+
+    async def addons(request):
+        ids = await request.json()
+        batches.append(sorted(ids))
+        # Ids of 100 and above don't exist
+        return web.json_response([{'id': i, 'name': f'addon{i}'} for i in ids if i < 100])
+
+    app = web.Application()
+    app.router.add_post('/addon', addons)
+    return app, batches
+
+
+@run
+async def test_calls_in_one_window_share_a_request():
+    app, batches = make_app()
+    async with serve(app) as url, CurseForge(batch_window=0.01, base_url=url) as cf:
+        addons = await asyncio.gather(*(cf.get_addon(i) for i in (3, 1, 2, 1)))
+    assert [a.id for a in addons] == [3, 1, 2, 1]
+    assert addons[1] is addons[3]
+    assert batches == [[1, 2, 3]]
+
+
+@run
+async def test_full_batch_is_sent_early():
+    app, batches = make_app()
+    async with serve(app) as url, CurseForge(batch_window=10, batch_size=2, base_url=url) as cf:
+        addons = await asyncio.wait_for(asyncio.gather(cf.get_addon(1), cf.get_addon(2)), 1)
+    assert [a.id for a in addons] == [1, 2]
+    assert batches == [[1, 2]]
+
+
+@run
+async def test_unknown_id_raises_like_an_unbatched_call():
+    app, _ = make_app()
+    async with serve(app) as url, CurseForge(batch_window=0.01, base_url=url) as cf:
+        found, missing = await asyncio.gather(cf.get_addon(1), cf.get_addon(404), return_exceptions=True)
+    assert found.id == 1
+    assert isinstance(missing, AddonNotFoundError)
+    assert missing.addon_id == 404
+
+
+@run
+async def test_unknown_id_goes_through_the_error_handler():
+    app, _ = make_app()
+    errors = []
+    async with serve(app) as url, CurseForge(batch_window=0.01, base_url=url) as cf:
+        cf.error(errors.append)
+        assert await cf.get_addon(404) is None
+    assert [e.addon_id for e in errors] == [404]
+
+
+@run
+async def test_close_sends_the_pending_batch():
+    app, batches = make_app()
+    async with serve(app) as url:
+        cf = CurseForge(batch_window=10, base_url=url)
+        pending = asyncio.ensure_future(cf.get_addon(5))
+        await asyncio.sleep(0)
+        await cf.close()
+        assert pending.done()
+        assert (await pending).id == 5
+    assert batches == [[5]]
+
+
+@run
+async def test_batched_addons_are_cached():
+    app, batches = make_app()
+    async with serve(app) as url, CurseForge(cache=MemoryCache(), batch_window=0.01, base_url=url) as cf:
+        first = await cf.get_addon(7)
+        assert await cf.get_addon(7) is first
+    assert batches == [[7]]
+
+
+@run
+async def test_failed_batch_reaches_every_waiter():
+    async def addons(request):
+        return web.Response(status=500)
+
+    app = web.Application()
+    app.router.add_post('/addon', addons)
+    async with serve(app) as url, CurseForge(batch_window=0.01, base_url=url) as cf:
+        results = await asyncio.gather(cf.get_addon(1), cf.get_addon(2), return_exceptions=True)
+    assert all(isinstance(r, CurseForgeException) and r.response.status == 500 for r in results)
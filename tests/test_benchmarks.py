@@ -0,0 +1,37 @@
+from benchmarks import dates, models, run as bench_run, server, throughput
+from curseforge import CurseForge
+from tests.helpers import run
+
+
+@run
+async def test_mock_server_serves_every_scenario():
+    runner, url = await server.start()
+    try:
+        async with CurseForge(base_url=url) as cf:
+            for name, call in throughput.SCENARIOS.items():
+                assert await call(cf, 1) is not None, name
+            assert (await cf.get_addon(1)).id == server.load_fixture('addon')['id']
+            assert len(await cf.get_addons(range(3))) == 3
+    finally:
+        await runner.cleanup()
+
+
+@run
+async def test_throughput_results():
+    results = await throughput.run(calls=4, concurrency=(2,), scenarios=['get_addon', 'get_mod_loaders'])
+    for name in ('get_addon', 'get_mod_loaders'):
+        result = results[name]['c=2']
+        assert result['calls'] == 4
+        assert result['latency_ms']['p50'] <= result['latency_ms']['max']
+        assert result['bytes_per_request'] > 0
+    # Concurrent calls with no arguments share requests
+    assert results['get_mod_loaders']['c=2']['requests'] <= results['get_addon']['c=2']['requests']
+
+
+def test_cpu_benchmarks_run():
+    assert all(v > 0 for v in bench_run.flatten(models.run(2)).values())
+    assert all(v > 0 for v in bench_run.flatten(dates.run(10)).values())
+
+
+def test_flatten():
+    assert bench_run.flatten({'a': {'b': 1, 'c': {'d': 2.5}}, 'e': True, 'f': 'x'}) == {'a.b': 1, 'a.c.d': 2.5}
@@ -0,0 +1,102 @@
+import time
+
+import pytest
+from aiohttp import web
+
+from cache import Cache, MemoryCache
+from curseforge import DEFAULT_TTLS, CurseForge
+from tests.helpers import run, serve
+
+
+def make_app():
+    state = {'etag': '"v1"', 'name': 'first'}
+    conditions = []
+
+    async def addon(request):
+        conditions.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == state['etag']:
+            return web.Response(status=304, headers={'ETag': state['etag']})
+        return web.json_response({'id': 1, 'name': state['name']}, headers={'ETag': state['etag']})
+
+    async def game(request):
+        conditions.append(request.headers.get('If-None-Match'))
+        return web.json_response({'id': 432, 'name': 'Minecraft'})
+
+    app = web.Application()
+    app.router.add_get('/addon/{addon_id}', addon)
+    app.router.add_get('/game/{game_id}', game)
+    return app, state, conditions
+
+
+def test_cache_is_abstract():
+    with pytest.raises(TypeError):
+        Cache()
+
+
+def test_hits_and_misses():
+    cache = MemoryCache()
+    assert cache.get('a') is None
+    cache.set('a', 1, 60)
+    assert cache.get('a').value == 1
+    assert (cache.hits, cache.misses, cache.hit_rate) == (1, 1, 0.5)
+
+
+def test_least_recently_used_is_evicted():
+    cache = MemoryCache(max_size=2)
+    cache.set('a', 1, 60)
+    cache.set('b', 2, 60)
+    cache.get('a')
+    cache.set('c', 3, 60)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a').value == 1
+    assert cache.get('c').value == 3
+
+
+def test_expired_entries_are_dropped():
+    cache = MemoryCache()
+    cache.set('never', 1, 0)
+    cache.set('short', 2, 0.01)
+    time.sleep(0.02)
+    assert cache.get('never') is None
+    assert cache.get('short') is None
+    assert len(cache) == 0
+
+
+def test_delete_and_clear():
+    cache = MemoryCache()
+    cache.set('a', 1, 60)
+    cache.set('b', 2, 60)
+    cache.delete('a')
+    cache.delete('missing')
+    assert [k for k, _ in cache.items()] == ['b']
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_ttls_are_per_client():
+    first = CurseForge()
+    first.ttls['addon'] = 0
+    assert CurseForge().ttls['addon'] == DEFAULT_TTLS['addon'] == 5 * 60
+
+
+@run
+async def test_fresh_entry_skips_the_network():
+    app, _, conditions = make_app()
+    async with serve(app) as url, CurseForge(cache=MemoryCache(), ttls={'addon': 60}, base_url=url) as cf:
+        first = await cf.get_addon(1)
+        assert await cf.get_addon(1) is first
+    assert conditions == [None]
+    assert cf.cache.hits == 1
+
+
+@run
+async def test_ttl_is_looked_up_by_path_prefix():
+    app, _, conditions = make_app()
+    # Only game/ has a TTL here, so the second addon call has to revalidate its entry
+    async with serve(app) as url, CurseForge(cache=MemoryCache(), ttls={'game': 60}, base_url=url) as cf:
+        await cf.get_game(432)
+        await cf.get_game(432)
+        await cf.get_addon(2)
+        await cf.get_addon(2)
+    assert conditions == [None, None, '"v1"']
@@ -0,0 +1,105 @@
+import asyncio
+import gc
+
+import pytest
+from aiohttp import web
+
+from benchmarks import server
+from curseforge import CurseForge, CurseForgeException
+from objects import Addon, AddonFile, FingerprintResponse, ModLoaderDetails
+from tests.helpers import run, serve
+
+
+@run
+async def test_identical_requests_share_one_round_trip():
+    runner, url = await server.start(latency=0.05)
+    events = []
+    try:
+        async with CurseForge(base_url=url) as cf:
+            cf.on_request_end(events.append)
+            addons = await asyncio.gather(*(cf.get_addon(238222) for _ in range(10)))
+            other = await cf.get_addon(1)
+    finally:
+        await runner.cleanup()
+    assert len(events) == 2
+    assert all(a is addons[0] for a in addons)
+    assert other is not addons[0]
+
+
+@run
+async def test_cancelled_waiter_leaves_the_others():
+    runner, url = await server.start(latency=0.05)
+    try:
+        async with CurseForge(base_url=url) as cf:
+            first = asyncio.ensure_future(cf.get_addon(238222))
+            second = asyncio.ensure_future(cf.get_addon(238222))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            addon = await second
+    finally:
+        await runner.cleanup()
+    assert first.cancelled()
+    assert addon.id == 238222
+
+
+def failing_app():
+    async def addon(request):
+        await asyncio.sleep(0.05)
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get('/addon/{addon_id}', addon)
+    return app
+
+
+@run
+async def test_failure_reaches_every_waiter():
+    async with serve(failing_app()) as url, CurseForge(base_url=url) as cf:
+        results = await asyncio.gather(*(cf.get_addon(1) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, CurseForgeException) and r.response.status == 404 for r in results)
+
+
+@run
+async def test_orphaned_failure_is_not_reported_as_unhandled():
+    unhandled = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+    async with serve(failing_app()) as url, CurseForge(base_url=url) as cf:
+        waiter = asyncio.ensure_future(cf.get_addon(1))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.1)
+    # The cancelled waiter's traceback still references the shared task
+    del waiter
+    gc.collect()
+    assert unhandled == []
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_shared_models_are_read_only(lazy):
+    file = AddonFile({'id': 1, 'gameVersion': ['1.16.5', 'Forge']}, lazy=lazy)
+    with pytest.raises(AttributeError):
+        file.id = 2
+    with pytest.raises(AttributeError):
+        del file.id
+    assert file.game_versions == ('1.16.5', 'Forge')
+    response = FingerprintResponse({'exactFingerprints': [1], 'partialMatchFingerprints': {'1': [2]}}, lazy=lazy)
+    assert response.exact_fingerprints == (1,)
+    with pytest.raises(TypeError):
+        response.partial_match_fingerprints['1'] = [3]
+    assert response.partial_match_fingerprints['1'] == (2,)
+    details = ModLoaderDetails({'versionJson': '{"libraries": [{"name": "a"}]}'}, lazy=lazy)
+    with pytest.raises(TypeError):
+        details.version['libraries'] = ()
+    assert details.version['libraries'][0]['name'] == 'a'
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_to_json_returns_a_copy(lazy):
+    j = {'id': 1, 'name': 'jei', 'latestFiles': [{'id': 2, 'gameVersion': ['1.16.5']}]}
+    addon = Addon(j, lazy=lazy)
+    out = addon.to_json()
+    out['name'] = 'changed'
+    out['latestFiles'][0]['gameVersion'].append('1.17')
+    assert addon.name == 'jei'
+    assert addon.to_json()['latestFiles'][0]['gameVersion'] == ['1.16.5']
+    assert j['latestFiles'][0]['gameVersion'] == ['1.16.5']
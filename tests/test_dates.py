@@ -0,0 +1,45 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from objects import iso_8601_to_datetime
+
+
+def reference(date: str) -> datetime:
+    try:
+        return datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%fZ')
+    except ValueError:
+        return datetime.strptime(date, '%Y-%m-%dT%H:%M:%SZ')
+
+
+@pytest.mark.parametrize('date', [
+    '2021-04-28T06:35:22Z',
+    '2021-04-28T06:35:22.1Z',
+    '2021-04-28T06:35:22.14Z',
+    '2021-04-28T06:35:22.143Z',
+    '2021-04-28T06:35:22.000001Z',
+    '2021-04-28T06:35:22.999999Z',
+    '2000-02-29T23:59:59.5Z',
+    '1970-01-01T00:00:00Z',
+])
+def test_matches_strptime(date):
+    assert iso_8601_to_datetime(date) == reference(date)
+
+
+def test_matches_strptime_on_random_dates():
+    rng = random.Random(7)
+    start = datetime(2008, 1, 1)
+    for _ in range(2000):
+        value = start + timedelta(seconds=rng.randrange(500_000_000), microseconds=rng.randrange(1_000_000))
+        date = value.isoformat(timespec='microseconds')
+        # CurseForge trims trailing zeros from the fraction, and sometimes drops it entirely
+        date = date.rstrip('0').rstrip('.') if rng.random() < 0.5 else date[:19]
+        assert iso_8601_to_datetime(date + 'Z') == reference(date + 'Z')
+
+
+@pytest.mark.parametrize('date', ['2021-13-28T06:35:22Z', '2021-04-28T06:35:22', '2021-04-28 06:35:22Z',
+                                  '2021-04-28T06:35:22+00:00', 'yesterday', ''])
+def test_invalid_dates_raise(date):
+    with pytest.raises(ValueError):
+        iso_8601_to_datetime(date)
@@ -0,0 +1,121 @@
+import os
+
+import pytest
+from aiohttp import web
+
+from curseforge import CurseForge
+from download import DownloadError, Downloader
+from objects import AddonFile
+from tests.helpers import run, serve
+
+BODY = bytes(range(256)) * 64
+
+
+def make_app(honour_range: bool, body: bytes = BODY):
+    ranges = []
+
+    async def download(request):
+        ranges.append(request.headers.get('Range'))
+        if honour_range and 'Range' in request.headers:
+            start = int(request.headers['Range'][len('bytes='):].rstrip('-'))
+            if start >= len(body):
+                return web.Response(status=416)
+            return web.Response(status=206, body=body[start:],
+                                headers={'Content-Range': f'bytes {start}-{len(body) - 1}/{len(body)}'})
+        return web.Response(body=body)
+
+    app = web.Application()
+    app.router.add_get('/files/mod.jar', download)
+    return app, ranges
+
+
+def addon_file(url: str, size: int = len(BODY)) -> AddonFile:
+    return AddonFile({'id': 1, 'fileName': 'mod.jar', 'fileLength': size, 'downloadUrl': url + 'files/mod.jar'})
+
+
+def write_part(directory, data: bytes):
+    with open(os.path.join(directory, 'mod.jar.part'), 'wb') as f:
+        f.write(data)
+
+
+def read(path) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@run
+async def test_download(tmp_path):
+    app, ranges = make_app(True)
+    async with serve(app) as url, CurseForge() as cf:
+        path = await Downloader(cf, str(tmp_path), chunk_size=1000).download(addon_file(url))
+    assert read(path) == BODY
+    assert ranges == [None]
+    assert not os.path.exists(path + '.part')
+
+
+@run
+async def test_resume_with_range(tmp_path):
+    app, ranges = make_app(True)
+    write_part(tmp_path, BODY[:5000])
+    async with serve(app) as url, CurseForge() as cf:
+        path = await Downloader(cf, str(tmp_path)).download(addon_file(url))
+    assert read(path) == BODY
+    assert ranges == ['bytes=5000-']
+
+
+@run
+async def test_resume_when_range_is_ignored(tmp_path):
+    app, ranges = make_app(False)
+    write_part(tmp_path, BODY[:5000])
+    async with serve(app) as url, CurseForge() as cf:
+        path = await Downloader(cf, str(tmp_path)).download(addon_file(url))
+    # A 200 carries the whole file, so the partial download is overwritten rather than appended to
+    assert read(path) == BODY
+    assert ranges == ['bytes=5000-']
+
+
+@run
+async def test_stale_part_restarts(tmp_path):
+    app, ranges = make_app(True, BODY[:4000])
+    write_part(tmp_path, BODY[:5000])
+    async with serve(app) as url, CurseForge() as cf:
+        path = await Downloader(cf, str(tmp_path)).download(addon_file(url, 4000))
+    assert read(path) == BODY[:4000]
+    assert ranges == [None]
+
+
+@run
+async def test_size_mismatch(tmp_path):
+    app, _ = make_app(True)
+    progress = []
+    async with serve(app) as url, CurseForge() as cf:
+        downloader = Downloader(cf, str(tmp_path), progress=lambda f, done, total: progress.append((done, total)))
+        with pytest.raises(DownloadError, match='expected 20000 bytes, got 16384'):
+            await downloader.download(addon_file(url, 20000))
+    assert progress[-1] == (len(BODY), 20000)
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize('name, expected', [('../../evil.jar', 'evil.jar'), ('/abs/path/mod.jar', 'mod.jar'),
+                                            ('..\\..\\win.jar', 'win.jar'), ('mod.jar', 'mod.jar')])
+def test_path_stays_in_directory(tmp_path, name, expected):
+    downloader = Downloader(None, str(tmp_path))
+    assert downloader.path(AddonFile({'fileName': name})) == os.path.join(str(tmp_path), expected)
+
+
+@pytest.mark.parametrize('name', ['', '.', '..', '../', None])
+def test_unsafe_names_are_rejected(tmp_path, name):
+    with pytest.raises(DownloadError, match='unsafe file name'):
+        Downloader(None, str(tmp_path)).path(AddonFile({'fileName': name}))
+
+
+@run
+async def test_traversal_name_is_written_inside(tmp_path):
+    app, _ = make_app(True)
+    target = tmp_path / 'mods'
+    async with serve(app) as url, CurseForge() as cf:
+        file = AddonFile({'id': 1, 'fileName': '../escaped.jar', 'fileLength': len(BODY),
+                          'downloadUrl': url + 'files/mod.jar'})
+        path = await Downloader(cf, str(target)).download(file)
+    assert path == os.path.join(str(target), 'escaped.jar')
+    assert not (tmp_path / 'escaped.jar').exists()
@@ -0,0 +1,198 @@
+import os
+import random
+
+import pytest
+from aiohttp import web
+
+from cache import MemoryCache
+from curseforge import CurseForge, CurseForgeException, FingerprintMatchError
+from fingerprint import Fingerprinter, fingerprint, fingerprint_file, murmur2
+from retry import RetryPolicy
+from snapshot import dump_snapshot, load_snapshot
+from tests.helpers import run, serve
+
+
+def reference_murmur2(data: bytes, seed: int = 1) -> int:
+    # The reference algorithm one byte at a time, to check the word-wise implementation against
+    m = 0x5bd1e995
+    length = len(data)
+    h = (seed ^ length) & 0xffffffff
+    i = 0
+    while length - i >= 4:
+        k = data[i] | data[i + 1] << 8 | data[i + 2] << 16 | data[i + 3] << 24
+        k = (k * m) & 0xffffffff
+        k ^= k >> 24
+        k = (k * m) & 0xffffffff
+        h = ((h * m) & 0xffffffff) ^ k
+        i += 4
+    rest = length - i
+    if rest == 3:
+        h ^= data[i + 2] << 16
+    if rest >= 2:
+        h ^= data[i + 1] << 8
+    if rest >= 1:
+        h ^= data[i]
+        h = (h * m) & 0xffffffff
+    h ^= h >> 13
+    h = (h * m) & 0xffffffff
+    return h ^ (h >> 15)
+
+
+def test_murmur2_matches_the_reference():
+    rng = random.Random(0)
+    for length in list(range(16)) + [1000, 4097]:
+        data = bytes(rng.randrange(256) for _ in range(length))
+        assert murmur2(data) == reference_murmur2(data), length
+        assert murmur2(data, 0) == reference_murmur2(data, 0), length
+
+
+def test_known_values():
+    assert murmur2(b'') == 1540447798
+    assert fingerprint(b'hello world') == fingerprint(b'helloworld') == murmur2(b'helloworld')
+
+
+def test_whitespace_is_stripped():
+    assert fingerprint(b'a\tb\nc\rd e') == murmur2(b'abcde')
+    # Other control bytes count
+    assert fingerprint(b'a\x0bb') == murmur2(b'a\x0bb')
+
+
+def write(directory, name: str, data: bytes) -> str:
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def test_scan_hashes_in_processes(tmp_path):
+    paths = [write(tmp_path, f'{i}.jar', os.urandom(100 + i)) for i in range(3)]
+    results = Fingerprinter(processes=2).scan(paths)
+    assert results == {p: fingerprint_file(p) for p in paths}
+
+
+def test_scan_reuses_the_cache(tmp_path):
+    cache_path = str(tmp_path / 'cache.json')
+    path = write(tmp_path, 'a.jar', b'first')
+    assert Fingerprinter(cache_path).scan([path]) == {path: fingerprint(b'first')}
+    # A stored hash is trusted while mtime and size match, so a fake entry proves the file wasn't read
+    with open(cache_path) as f:
+        stored = f.read()
+    with open(cache_path, 'w') as f:
+        f.write(stored.replace(str(fingerprint(b'first')), '7'))
+    assert Fingerprinter(cache_path).scan([path]) == {path: 7}
+    os.utime(path, ns=(0, 0))
+    assert Fingerprinter(cache_path).scan([path]) == {path: fingerprint(b'first')}
+
+
+def test_scan_directory_filters_by_extension(tmp_path):
+    jar = write(tmp_path, 'a.jar', b'jar')
+    write(tmp_path, 'notes.txt', b'txt')
+    assert list(Fingerprinter().scan_directory(str(tmp_path))) == [jar]
+
+
+@run
+async def test_match_sends_the_scanned_fingerprints(tmp_path):
+    sent = []
+
+    async def match(request):
+        fingerprints = await request.json()
+        sent.extend(fingerprints)
+        return web.json_response({'exactMatches': [], 'unmatchedFingerprints': fingerprints})
+
+    app = web.Application()
+    app.router.add_post('/fingerprint', match)
+    paths = [write(tmp_path, f'{i}.jar', bytes([i]) * 10) for i in range(3)]
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        response = await Fingerprinter(processes=2).match(cf, paths)
+    assert sorted(sent) == sorted(fingerprint_file(p) for p in paths)
+    assert sorted(response.unmatched_fingerprints) == sorted(sent)
+
+
+def match_app(failing=()):
+    chunks = []
+
+    async def match(request):
+        fingerprints = await request.json()
+        chunks.append(sorted(fingerprints))
+        if set(fingerprints) & set(failing):
+            return web.Response(status=400)
+        # Even fingerprints belong to file fingerprint // 2 of addon 1
+        even = [f for f in fingerprints if f % 2 == 0]
+        return web.json_response({
+            'isCacheBuilt': True,
+            'exactMatches': [{'id': 1, 'file': {'id': f // 2, 'packageFingerprint': f}} for f in even],
+            'exactFingerprints': even,
+            'installedFingerprints': fingerprints,
+            'unmatchedFingerprints': [f for f in fingerprints if f % 2],
+            'partialMatchFingerprints': {},
+        })
+
+    app = web.Application()
+    app.router.add_post('/fingerprint', match)
+    return app, chunks
+
+
+@run
+async def test_chunks_are_merged():
+    app, chunks = match_app()
+    async with serve(app) as url, CurseForge(fingerprint_chunk_size=2, base_url=url) as cf:
+        response = await cf.get_fingerprint_addons([1, 2, 3, 4, 5, 2])
+    assert sorted(chunks) == [[1, 2], [3, 4], [5]]
+    assert sorted(m.file.id for m in response.exact_matches) == [1, 2]
+    assert sorted(response.exact_fingerprints) == [2, 4]
+    assert sorted(response.unmatched_fingerprints) == [1, 3, 5]
+
+
+@run
+async def test_failed_chunk_keeps_the_others():
+    app, _ = match_app(failing=(3,))
+    retry = RetryPolicy(attempts=1)
+    async with serve(app) as url, CurseForge(fingerprint_chunk_size=2, fingerprint_retry=retry, base_url=url) as cf:
+        with pytest.raises(FingerprintMatchError) as e:
+            await cf.get_fingerprint_addons([1, 2, 3, 4, 5])
+        assert e.value.failed == [3, 4]
+        assert [type(error) for error in e.value.errors] == [CurseForgeException]
+        assert sorted(e.value.partial.exact_fingerprints) == [2]
+        assert sorted(e.value.partial.unmatched_fingerprints) == [1, 5]
+        errors = []
+        cf.error(errors.append)
+        response = await cf.get_fingerprint_addons([1, 2, 3, 4, 5])
+    assert sorted(response.unmatched_fingerprints) == [1, 5]
+    assert errors[-1].failed == [3, 4]
+
+
+@run
+async def test_matches_use_their_own_cache():
+    app, chunks = match_app()
+    cache = MemoryCache(max_size=2)
+    async with serve(app) as url, CurseForge(cache=cache, fingerprint_cache_size=100, base_url=url) as cf:
+        await cf.get_fingerprint_addons(range(1, 11))
+        response = await cf.get_fingerprint_addons(range(1, 12))
+    # Only the fingerprint not seen before is asked about again
+    assert chunks == [list(range(1, 11)), [11]]
+    assert sorted(response.exact_fingerprints) == [2, 4, 6, 8, 10]
+    assert sorted(response.unmatched_fingerprints) == [1, 3, 5, 7, 9, 11]
+    assert len(cache) == 0
+    assert len(cf.fingerprint_cache) == 11
+
+
+def test_no_fingerprint_cache_without_a_cache():
+    assert CurseForge().fingerprint_cache is None
+    custom = MemoryCache()
+    assert CurseForge(cache=MemoryCache(), fingerprint_cache=custom).fingerprint_cache is custom
+
+
+@run
+async def test_snapshots_keep_the_matches(tmp_path):
+    app, chunks = match_app()
+    path = str(tmp_path / 'worker.snap')
+    async with serve(app) as url:
+        async with CurseForge(cache=MemoryCache(), base_url=url) as cf:
+            await cf.get_fingerprint_addons([1, 2])
+            dump_snapshot(cf, path)
+        async with CurseForge(cache=MemoryCache(), base_url=url) as cf:
+            load_snapshot(cf, path)
+            assert len(cf.cache) == 0
+            response = await cf.get_fingerprint_addons([1, 2])
+    assert chunks == [[1, 2]]
+    assert response.exact_fingerprints == (2,)
@@ -0,0 +1,120 @@
+import sqlite3
+
+import pytest
+from aiohttp import web
+
+from curseforge import CurseForge
+from index import AddonIndex
+from objects import Addon, Category, ModLoaderType
+from tests.helpers import run, serve
+
+
+def addon(addon_id: int, modified: str = '2021-01-01T00:00:00Z', version: str = '1.16.5',
+          loader: int = ModLoaderType.FORGE, category: int = 423, popularity: float = 0, **extra) -> dict:
+    return dict({
+        'id': addon_id, 'gameId': 432, 'name': f'addon{addon_id}', 'slug': f'addon-{addon_id}',
+        'popularityScore': popularity, 'downloadCount': addon_id, 'dateModified': modified,
+        'primaryCategoryId': category, 'categories': [{'categoryId': category}],
+        'gameVersionLatestFiles': [{'gameVersion': version, 'modLoader': int(loader), 'projectFileId': addon_id * 10}],
+        'latestFiles': [{'id': addon_id * 10, 'packageFingerprint': addon_id * 100}],
+    }, **extra)
+
+
+def make_index(*addons: dict, cf: CurseForge = None) -> AddonIndex:
+    cf = cf or CurseForge()
+    index = AddonIndex(':memory:', cf)
+    index.add_addons(Addon(j, cf=cf) for j in addons)
+    return index
+
+
+def test_query_filters_and_orders():
+    index = make_index(addon(1, popularity=1), addon(2, popularity=3, version='1.17'),
+                       addon(3, popularity=2, loader=ModLoaderType.FABRIC, category=7))
+    assert [a.id for a in index.query(432)] == [2, 3, 1]
+    assert [a.id for a in index.query(432, game_version='1.16.5')] == [3, 1]
+    assert [a.id for a in index.query(game_version='1.16.5', mod_loader=ModLoaderType.FORGE)] == [1]
+    assert [a.id for a in index.query(category_id=7)] == [3]
+    assert [a.id for a in index.query(name='addon2')] == [2]
+    assert [a.id for a in index.query(order_by='name', limit=1, offset=1)] == [2]
+    assert index.query(433) == []
+
+
+def test_lookups():
+    index = make_index(addon(1), addon(2))
+    assert index.get(1).name == 'addon1'
+    assert index.get(3) is None
+    assert index.by_slug('addon-2').id == 2
+    assert index.by_slug('addon-2', game_id=433) is None
+    assert [(a.id, file_id) for a, file_id in index.by_fingerprint(200)] == [(2, 20)]
+
+
+def test_rows_load_as_lazy_models():
+    index = make_index(addon(1))
+    loaded = index.get(1)
+    assert loaded._lazy
+    assert index.get(1) is loaded
+    assert loaded.modified_at.year == 2021
+
+
+def test_older_copies_do_not_replace_newer_ones():
+    index = make_index(addon(1, '2021-02-01T00:00:00Z', name='new'))
+    assert index.add_addons([Addon(addon(1, '2021-01-01T00:00:00Z', name='old'))]) == 0
+    assert index.get(1).name == 'new'
+    assert index.add_addons([Addon(addon(1, '2021-03-01T00:00:00Z', name='newer'))]) == 1
+    assert index.get(1).name == 'newer'
+    assert index.last_modified(432) == '2021-03-01T00:00:00.000000'
+
+
+def test_categories():
+    index = make_index()
+    index.add_categories([Category({'id': 1, 'gameId': 432, 'slug': 'mods'}), Category({'id': 2, 'gameId': 1})])
+    assert [c.slug for c in index.categories(432)] == ['mods']
+    assert len(index.categories()) == 2
+
+
+def test_old_schema_is_dropped(tmp_path):
+    path = str(tmp_path / 'index.db')
+    db = sqlite3.connect(path)
+    db.execute('CREATE TABLE addons (id INTEGER PRIMARY KEY, data BLOB)')
+    db.execute('INSERT INTO addons VALUES (1, ?)', (b'pickled',))
+    db.commit()
+    db.close()
+    index = AddonIndex(path, CurseForge())
+    assert index.get(1) is None
+    index.add_addons([Addon(addon(1))])
+    index.close()
+    assert AddonIndex(path, CurseForge()).get(1).id == 1
+
+
+@run
+async def test_refresh_stops_at_the_watermark():
+    catalogue = [addon(i, f'2021-01-{10 - i:02}T00:00:00Z') for i in range(1, 8)]
+    indexes = []
+
+    async def search(request):
+        index = int(request.query.get('index', 0))
+        indexes.append(index)
+        size = int(request.query['pageSize'])
+        return web.json_response(catalogue[index:index + size])
+
+    app = web.Application()
+    app.router.add_get('/addon/search', search)
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        index = make_index(*catalogue[4:], cf=cf)
+        assert await index.refresh(432, page_size=2) == 4
+    assert [a.id for a in index.query(order_by='modified')] == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_models_round_trip():
+    cf = CurseForge()
+    models = {'addons': [Addon(addon(1)), Addon(addon(2), lazy=True)], 'pair': (Category({'id': 1}), None)}
+    loaded = cf.load_models(CurseForge.dump_models(models))
+    assert [a.to_json() for a in loaded['addons']] == [a.to_json() for a in models['addons']]
+    assert loaded['addons'][1]._lazy
+    assert isinstance(loaded['pair'], tuple) and loaded['pair'][1] is None
+    assert loaded['addons'][0]._cf is cf
+
+
+def test_unknown_models_are_rejected():
+    with pytest.raises(ValueError):
+        CurseForge().load_models(b'["m","os.system",{},true,false]')
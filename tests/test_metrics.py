@@ -0,0 +1,89 @@
+import pytest
+from aiohttp import web
+
+from cache import MemoryCache
+from curseforge import CurseForge, CurseForgeException
+from metrics import Histogram, Metrics, RequestEvent, endpoint
+from retry import RetryPolicy
+from tests.helpers import run, serve
+
+
+def test_endpoint_folds_ids():
+    assert endpoint('addon/238222/file/3272082') == 'addon/{id}/file/{id}'
+    assert endpoint('minecraft/version/1.16.5/') == 'minecraft/version/{id}'
+    assert endpoint('addon/search?gameId=432') == 'addon/search'
+
+
+def test_histogram():
+    h = Histogram((1, 2, 5))
+    for value in (0.5, 1, 1.5, 3, 10):
+        h.observe(value)
+    assert h.cumulative() == [(1, 2), (2, 3), (5, 4), (float('inf'), 5)]
+    assert h.quantile(0.5) == 2
+    assert h.quantile(1) == float('inf')
+    assert h.mean == 16 / 5
+    assert Histogram(()).quantile(0.5) is None
+
+
+def test_record_counts_errors_and_cache_hits():
+    metrics = Metrics()
+    for status, cached, attempts in ((200, False, 1), (503, False, 3), (None, True, 0)):
+        event = RequestEvent('GET', 'addon/1')
+        event.status, event.cached, event.attempts, event.elapsed = status, cached, attempts, 0.01
+        metrics.record(event)
+    m = metrics.endpoints['GET', 'addon/{id}']
+    assert (m.requests, m.errors, m.retries, m.cache_hits) == (3, 1, 2, 1)
+    assert m.statuses == {200: 1, 503: 1}
+    # Cache hits don't skew the latency histograms
+    assert m.latency.count == 2
+    assert m.cache_hit_rate == 1 / 3
+
+
+def make_app():
+    statuses = [503, 200]
+
+    async def addon(request):
+        return web.json_response({'id': 1}, status=statuses.pop(0) if statuses else 200)
+
+    async def missing(request):
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get('/addon/{addon_id}', addon)
+    app.router.add_get('/game/{game_id}', missing)
+    return app
+
+
+@run
+async def test_client_events():
+    async with serve(make_app()) as url:
+        async with CurseForge(cache=MemoryCache(), retry=RetryPolicy(attempts=2, base_delay=0.01), base_url=url) as cf:
+            metrics = Metrics().attach(cf)
+            started = []
+            cf.on_request_start(started.append)
+            await cf.get_addon(1)
+            await cf.get_addon(1)
+            with pytest.raises(CurseForgeException):
+                await cf.get_game(432)
+    addon = metrics.endpoints['GET', 'addon/{id}']
+    assert (addon.requests, addon.retries, addon.cache_hits, addon.errors) == (2, 1, 1, 0)
+    assert addon.statuses == {200: 1}
+    assert addon.size.count == 1 and addon.build.count == 1
+    game = metrics.endpoints['GET', 'game/{id}']
+    assert (game.requests, game.errors, game.statuses) == (1, 1, {404: 1})
+    assert len(started) == 3
+    assert metrics.snapshot()['GET addon/{id}']['cache_hits'] == 1
+
+
+def test_prometheus_format():
+    metrics = Metrics(latency_buckets=(0.1,), size_buckets=(100,))
+    event = RequestEvent('GET', 'addon/1')
+    event.status, event.attempts, event.elapsed, event.size = 200, 1, 0.05, 10
+    metrics.record(event)
+    text = metrics.to_prometheus()
+    assert 'curseforge_requests_total{method="GET",endpoint="addon/{id}"} 1\n' in text
+    assert 'curseforge_responses_total{method="GET",endpoint="addon/{id}",status="200"} 1\n' in text
+    assert 'curseforge_request_latency_seconds_bucket{method="GET",endpoint="addon/{id}",le="+Inf"} 1\n' in text
+    assert 'curseforge_request_size_bytes_count{method="GET",endpoint="addon/{id}"} 1\n' in text
+    metrics.reset()
+    assert metrics.endpoints == {}
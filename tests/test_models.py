@@ -0,0 +1,104 @@
+from datetime import datetime
+
+import pytest
+
+from benchmarks.server import load_fixture
+from objects import Addon, AddonFile, FingerprintResponse, Minecraft, ModLoader, ModLoaderDetails, ReleaseType, _Model
+
+CASES = [
+    ('addon', Addon),
+    ('search', Addon),
+    ('files', AddonFile),
+    ('fingerprint', FingerprintResponse),
+    ('minecraft', Minecraft),
+    ('modloader', ModLoader),
+    ('modloader_details', ModLoaderDetails),
+]
+
+
+def payloads(fixture: str) -> list:
+    j = load_fixture(fixture)
+    return j if isinstance(j, list) else [j]
+
+
+def fields(v):
+    # Every field of a model tree as plain values, so two builds can be compared
+    if isinstance(v, _Model):
+        return {name: fields(getattr(v, name)) for name in v._fields}
+    if isinstance(v, tuple):
+        return [fields(e) for e in v]
+    return v
+
+
+@pytest.mark.parametrize('fixture, t', CASES)
+@pytest.mark.parametrize('serialise_date', [True, False])
+def test_lazy_matches_eager(fixture, t, serialise_date):
+    for j in payloads(fixture):
+        assert fields(t(j, serialise_date, lazy=True)) == fields(t(j, serialise_date))
+
+
+def test_lazy_decodes_on_first_access():
+    j = load_fixture('addon')
+    addon = Addon(j, lazy=True)
+    slot = Addon.latest_files
+    with pytest.raises(AttributeError):
+        slot.__get__(addon)
+    files = addon.latest_files
+    assert slot.__get__(addon) is files
+    assert addon.latest_files is files
+    assert all(f._lazy for f in files)
+    assert isinstance(addon.modified_at, datetime)
+
+
+def test_lazy_nested_models_share_the_settings():
+    addon = Addon(load_fixture('addon'), serialise_date=False, lazy=True)
+    file = addon.latest_files[0]
+    assert isinstance(file.uploaded_at, str)
+    assert isinstance(file.release_type, ReleaseType)
+
+
+def test_missing_fields_are_none():
+    for lazy in (False, True):
+        addon = Addon({'id': 1}, lazy=lazy)
+        assert addon.id == 1
+        assert addon.name is None
+        assert addon.latest_files is None
+        assert addon.modified_at is None
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        Addon({'id': 1}, lazy=True).nope
+
+
+@pytest.mark.parametrize('fixture, t', CASES)
+def test_models_use_slots_and_tuples(fixture, t):
+    for j in payloads(fixture):
+        model = t(j)
+        assert not hasattr(model, '__dict__')
+        for name in model._fields:
+            assert not isinstance(getattr(model, name), (list, dict)), name
+
+
+@pytest.mark.parametrize('fixture, t', CASES)
+@pytest.mark.parametrize('lazy', [False, True])
+def test_to_json_round_trip(fixture, t, lazy):
+    for j in payloads(fixture):
+        model = t(j, lazy=lazy)
+        assert fields(t(model.to_json())) == fields(model)
+
+
+def test_dependency_ids_can_be_read_twice():
+    file = AddonFile({'dependencies': [{'id': 1, 'addonId': 10, 'type': 3}, {'id': 2, 'addonId': 11, 'type': 2}]})
+    assert file.dependencies == (1, 2)
+    assert list(file.dependencies) == list(file.dependencies)
+    assert [d.addon_id for d in file.dependency_details] == [10, 11]
+
+
+def test_memory_benchmark_layouts():
+    from benchmarks import memory
+
+    sizes = memory.run(20)
+    assert sizes['eager_bytes_per_addon'] < sizes['dict_based_bytes_per_addon']
+    # A lazy model keeps its payload alive, so it can't be smaller than the payload itself
+    assert sizes['lazy_bytes_per_addon'] >= sizes['payload_bytes_per_addon']
@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+from curseforge import CurseForge
+from ratelimit import RateLimiter, TokenBucket
+from tests.helpers import run, serve
+
+
+@run
+async def test_bucket_spaces_out_requests():
+    bucket = TokenBucket(20, 1)
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+@run
+async def test_burst_is_served_at_once():
+    bucket = TokenBucket(1, 5)
+    start = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+@run
+async def test_concurrency_is_capped():
+    limiter = RateLimiter(max_concurrency=2)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with limiter.limit('addon/1'):
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+@run
+async def test_throttled_family_does_not_hold_slots():
+    async def addon(request):
+        return web.json_response({'id': 1})
+
+    async def fingerprint(request):
+        return web.json_response({'exactMatches': [], 'unmatchedFingerprints': await request.json()})
+
+    app = web.Application()
+    app.router.add_get('/addon/{addon_id}', addon)
+    app.router.add_post('/fingerprint', fingerprint)
+    limiter = RateLimiter(max_concurrency=2, endpoint_rates={'fingerprint': 1})
+    async with serve(app) as url, CurseForge(limiter=limiter, base_url=url) as cf:
+        throttled = [asyncio.ensure_future(cf.get_fingerprint_addons([n])) for n in range(5)]
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        await cf.get_addon(1)
+        assert time.monotonic() - start < 0.5
+        for task in throttled:
+            task.cancel()
+        await asyncio.gather(*throttled, return_exceptions=True)
+    assert limiter.in_flight == 0
+
+
+@run
+async def test_cancelled_waiter_gives_back_nothing_it_did_not_take():
+    limiter = RateLimiter(max_concurrency=1, endpoint_rates={'fingerprint': 1})
+    await limiter.acquire('fingerprint')
+    waiter = asyncio.ensure_future(limiter.acquire('fingerprint'))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    limiter.release()
+    await asyncio.wait_for(limiter.acquire('addon'), 0.1)
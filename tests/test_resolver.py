@@ -0,0 +1,108 @@
+import pytest
+from aiohttp import web
+
+from curseforge import CurseForge
+from objects import DependencyType, ModLoaderType
+from resolver import DependencyCycleError, DependencyResolver
+from tests.helpers import run, serve
+
+
+def file(file_id: int, *dependencies, versions=('1.16.5', 'Forge'), release_type: int = 1) -> dict:
+    return {'id': file_id, 'gameVersion': list(versions), 'releaseType': release_type,
+            'dependencies': [{'id': 1000 + i, 'addonId': a, 'type': t} for i, (a, t) in enumerate(dependencies)]}
+
+
+REQUIRED = DependencyType.REQUIRED
+OPTIONAL = DependencyType.OPTIONAL
+
+
+def make_app(addons: dict, files: dict = None):
+    requests = []
+
+    async def get_addons(request):
+        ids = await request.json()
+        requests.append(sorted(ids))
+        return web.json_response([{'id': i, 'latestFiles': addons[i]} for i in ids if i in addons])
+
+    async def get_files(request):
+        return web.json_response((files or {}).get(int(request.match_info['addon_id']), []))
+
+    app = web.Application()
+    app.router.add_post('/addon', get_addons)
+    app.router.add_get('/addon/{addon_id}/files', get_files)
+    return app, requests
+
+
+@run
+async def test_dependencies_come_first():
+    app, requests = make_app({
+        1: [file(10, (2, REQUIRED), (3, REQUIRED))],
+        2: [file(20, (4, REQUIRED))],
+        3: [file(30, (4, REQUIRED), (5, OPTIONAL))],
+        4: [file(40)],
+        5: [file(50)],
+    })
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        plan = await DependencyResolver(cf, '1.16.5').resolve([1])
+    order = [r.addon.id for r in plan]
+    assert order == [4, 2, 3, 1]
+    assert [r.file.id for r in plan] == [40, 20, 30, 10]
+    # One bulk request per level of the graph
+    assert requests == [[1], [2, 3], [4]]
+
+
+@run
+async def test_cycle_is_reported():
+    app, _ = make_app({
+        1: [file(10, (2, REQUIRED))],
+        2: [file(20, (3, REQUIRED))],
+        3: [file(30, (1, REQUIRED))],
+    })
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        with pytest.raises(DependencyCycleError) as e:
+            await DependencyResolver(cf, '1.16.5').resolve([1])
+    assert e.value.cycle == [1, 2, 3, 1]
+
+
+@run
+async def test_missing_addons_are_collected():
+    app, _ = make_app({1: [file(10, (404, REQUIRED))]})
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        resolver = DependencyResolver(cf, '1.16.5')
+        plan = await resolver.resolve([1, 405])
+    assert [r.addon.id for r in plan] == [1]
+    assert resolver.missing == {404, 405}
+
+
+@run
+async def test_dependency_without_addon_id_is_skipped():
+    raw = file(10)
+    raw['dependencies'] = [{'id': 7, 'type': 3}]
+    app, requests = make_app({1: [raw]})
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        plan = await DependencyResolver(cf, '1.16.5').resolve([1])
+    assert plan[0].dependencies == ()
+    assert requests == [[1]]
+
+
+@run
+async def test_file_is_picked_by_version_loader_and_release_type():
+    app, _ = make_app({1: [
+        file(10, versions=('1.16.5', 'Fabric')),
+        file(11),
+        file(12, release_type=2),
+        file(13, versions=('1.17', 'Forge')),
+    ]})
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        assert (await DependencyResolver(cf, '1.16.5', 'Forge').resolve([1]))[0].file.id == 11
+        assert (await DependencyResolver(cf, '1.16.5', ModLoaderType.FABRIC).resolve([1]))[0].file.id == 10
+        beta = DependencyResolver(cf, '1.16.5', 'Forge', release_type=2)
+        assert (await beta.resolve([1]))[0].file.id == 12
+
+
+@run
+async def test_older_files_are_looked_up():
+    app, _ = make_app({1: [file(13, versions=('1.17', 'Forge'))]}, {1: [file(5), file(6), file(13, versions=('1.17',))]})
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        plan = await DependencyResolver(cf, '1.16.5').resolve([1])
+    assert plan[0].file.id == 6
@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from curseforge import CircuitOpenError, CurseForge, CurseForgeException
+from retry import CircuitBreaker, RetryPolicy, parse_retry_after
+from tests.helpers import run, serve
+
+
+def open_breaker(recovery_time: float = 0.05) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=recovery_time)
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    return breaker
+
+
+def test_opens_after_threshold():
+    breaker = open_breaker()
+    assert not breaker.allow()
+
+
+def test_success_resets_the_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.failure()
+    breaker.success()
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_single_probe_after_recovery():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_probe_success_closes():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    breaker.allow()
+    breaker.success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_probe_failure_reopens():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    breaker.allow()
+    breaker.failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_abandoned_probe_allows_another():
+    breaker = open_breaker(recovery_time=60)
+    breaker.state = CircuitBreaker.HALF_OPEN
+    breaker.abandon()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow()
+
+
+def test_lost_probe_is_given_up_on():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3
+    assert parse_retry_after('-1') == 0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+
+
+def test_retry_delay():
+    policy = RetryPolicy(attempts=3, base_delay=1, max_delay=10)
+    assert 0 <= policy.delay(0) <= 1
+    assert policy.delay(1, retry_after=5) == 5
+    assert policy.delay(1, retry_after=11) is None
+    assert policy.delay(2) is None
+
+
+@run
+async def test_client_fails_fast_while_open():
+    calls = []
+
+    async def description(request):
+        calls.append(request.path)
+        return web.Response(status=503)
+
+    app = web.Application()
+    app.router.add_get('/addon/{addon_id}/description', description)
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=0.05)
+    async with serve(app) as url, CurseForge(retry=RetryPolicy(attempts=1), breaker=breaker, base_url=url) as cf:
+        for _ in range(2):
+            with pytest.raises(CurseForgeException):
+                await cf.get_addon_description(1)
+        with pytest.raises(CircuitOpenError):
+            await cf.get_addon_description(1)
+        assert len(calls) == 2
+        await asyncio.sleep(0.06)
+        # The probe fails too, so the circuit opens again without a third request getting through
+        with pytest.raises(CurseForgeException):
+            await cf.get_addon_description(1)
+        with pytest.raises(CircuitOpenError):
+            await cf.get_addon_description(1)
+    assert len(calls) == 3
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+@run
+async def test_cancelled_probe_does_not_stick_half_open():
+    async def description(request):
+        await asyncio.sleep(0.3)
+        return web.Response(text='')
+
+    app = web.Application()
+    app.router.add_get('/addon/{addon_id}/description', description)
+    breaker = open_breaker(recovery_time=0.05)
+    time.sleep(0.06)
+    async with serve(app) as url, CurseForge(retry=RetryPolicy(attempts=1), breaker=breaker, base_url=url) as cf:
+        probe = asyncio.ensure_future(cf.get_addon_description(1))
+        await asyncio.sleep(0.05)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow()
+
+
+@run
+async def test_client_retries_server_errors():
+    statuses = [503, 429, 200]
+    calls = []
+
+    async def description(request):
+        calls.append(request.path)
+        status = statuses[len(calls) - 1]
+        return web.Response(status=status, text='summary', headers={'Retry-After': '0'} if status == 429 else {})
+
+    app = web.Application()
+    app.router.add_get('/addon/{addon_id}/description', description)
+    async with serve(app) as url, CurseForge(retry=RetryPolicy(attempts=3, base_delay=0.01), base_url=url) as cf:
+        assert await cf.get_addon_description(1) == 'summary'
+    assert len(calls) == 3
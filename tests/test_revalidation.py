@@ -0,0 +1,76 @@
+from aiohttp import web
+
+from cache import MemoryCache
+from curseforge import CurseForge
+from tests.helpers import run, serve
+
+LAST_MODIFIED = 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+
+def make_app():
+    state = {'etag': '"v1"', 'name': 'first'}
+    conditions = []
+
+    async def addon(request):
+        conditions.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == state['etag']:
+            return web.Response(status=304, headers={'ETag': state['etag']})
+        return web.json_response({'id': 1, 'name': state['name']}, headers={'ETag': state['etag']})
+
+    async def description(request):
+        conditions.append(request.headers.get('If-Modified-Since'))
+        if request.headers.get('If-Modified-Since') == LAST_MODIFIED:
+            return web.Response(status=304)
+        return web.Response(text='summary', headers={'Last-Modified': LAST_MODIFIED})
+
+    app = web.Application()
+    app.router.add_get('/addon/{addon_id}', addon)
+    app.router.add_get('/addon/{addon_id}/description', description)
+    return app, state, conditions
+
+
+@run
+async def test_not_modified_reuses_the_parsed_value():
+    app, _, conditions = make_app()
+    # A zero TTL makes every later call revalidate the stored entry
+    async with serve(app) as url, CurseForge(cache=MemoryCache(), ttls={'addon': 0}, base_url=url) as cf:
+        first = await cf.get_addon(1)
+        assert await cf.get_addon(1) is first
+    assert conditions == [None, '"v1"']
+    assert cf.cache.revalidations == 1
+
+
+@run
+async def test_not_modified_renews_the_ttl():
+    app, _, conditions = make_app()
+    async with serve(app) as url, CurseForge(cache=MemoryCache(), ttls={'addon': 0}, base_url=url) as cf:
+        events = []
+        cf.on_request_end(events.append)
+        await cf.get_addon(1)
+        cf.ttls['addon'] = 60
+        await cf.get_addon(1)
+        await cf.get_addon(1)
+    assert conditions == [None, '"v1"']
+    assert [(e.revalidated, e.cached) for e in events] == [(False, False), (True, False), (False, True)]
+
+
+@run
+async def test_last_modified_revalidates():
+    app, _, conditions = make_app()
+    async with serve(app) as url, CurseForge(cache=MemoryCache(), ttls={}, base_url=url) as cf:
+        assert await cf.get_addon_description(1) == 'summary'
+        assert await cf.get_addon_description(1) == 'summary'
+    assert conditions == [None, LAST_MODIFIED]
+    assert cf.cache.revalidations == 1
+
+
+@run
+async def test_changed_etag_replaces_the_entry():
+    app, state, conditions = make_app()
+    async with serve(app) as url, CurseForge(cache=MemoryCache(), ttls={'addon': 0}, base_url=url) as cf:
+        await cf.get_addon(1)
+        state.update(etag='"v2"', name='second')
+        assert (await cf.get_addon(1)).name == 'second'
+        assert (await cf.get_addon(1)).name == 'second'
+    assert conditions == [None, '"v1"', '"v2"']
+    assert cf.cache.revalidations == 1
@@ -0,0 +1,75 @@
+import asyncio
+import gc
+
+import pytest
+from aiohttp import web
+
+from curseforge import CurseForge, CurseForgeException
+from tests.helpers import run, serve
+
+
+def make_app(total: int, fail_from: int = None, delay: float = 0, status: int = 500):
+    requested = []
+
+    async def search(request):
+        index = int(request.query.get('index', 0))
+        size = int(request.query['pageSize'])
+        requested.append(index)
+        if fail_from is not None and index >= fail_from:
+            return web.Response(status=status)
+        if index == 0:
+            await asyncio.sleep(delay)
+        return web.json_response([{'id': i} for i in range(index, min(index + size, total))])
+
+    app = web.Application()
+    app.router.add_get('/addon/search', search)
+    return app, requested
+
+
+@run
+async def test_walks_every_page():
+    app, requested = make_app(23)
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        ids = [a.id async for a in cf.iter_search_addons(432, page_size=5, prefetch=2)]
+    assert ids == list(range(23))
+    # Pages past the end are only ever the ones already read ahead
+    assert sorted(requested)[:5] == [0, 5, 10, 15, 20]
+    assert len(requested) <= 5 + 2
+
+
+@run
+async def test_reads_ahead():
+    app, requested = make_app(100, delay=0.05)
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        addons = cf.iter_search_addons(432, page_size=5, prefetch=3)
+        await addons.__anext__()
+        assert sorted(requested) == [0, 5, 10, 15]
+        await addons.aclose()
+
+
+@run
+async def test_failed_page_reaches_the_consumer():
+    app, _ = make_app(100, fail_from=10)
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        ids = []
+        with pytest.raises(CurseForgeException):
+            async for addon in cf.iter_search_addons(432, page_size=5, prefetch=1):
+                ids.append(addon.id)
+    assert ids == list(range(10))
+
+
+@run
+async def test_abandoned_failed_pages_are_not_reported():
+    unhandled = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+    # The first page is slow and a 400 isn't retried, so the prefetched pages have already failed when the consumer stops
+    app, requested = make_app(100, fail_from=5, delay=0.05, status=400)
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        addons = cf.iter_search_addons(432, page_size=5, prefetch=2)
+        await addons.__anext__()
+        await addons.aclose()
+        del addons
+        await asyncio.sleep(0.01)
+    gc.collect()
+    assert sorted(requested) == [0, 5, 10]
+    assert unhandled == []
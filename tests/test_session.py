@@ -0,0 +1,77 @@
+import aiohttp
+from aiohttp import web
+
+from curseforge import CurseForge
+from tests.helpers import run, serve
+
+
+def make_app():
+    encodings = []
+
+    async def description(request):
+        encodings.append(request.headers.get('Accept-Encoding'))
+        return web.Response(text='summary')
+
+    app = web.Application()
+    app.router.add_get('/addon/{addon_id}/description', description)
+    return app, encodings
+
+
+def test_no_session_before_first_use():
+    cf = CurseForge()
+    assert cf._CurseForge__session is None
+
+
+@run
+async def test_owned_session_is_closed():
+    app, _ = make_app()
+    async with serve(app) as url:
+        async with CurseForge(base_url=url) as cf:
+            assert await cf.get_addon_description(1) == 'summary'
+            session = cf.session
+            assert cf.session is session
+        assert session.closed
+
+
+@run
+async def test_session_is_recreated_after_close():
+    app, _ = make_app()
+    async with serve(app) as url:
+        cf = CurseForge(base_url=url)
+        first = cf.session
+        await cf.close()
+        assert cf.session is not first
+        assert await cf.get_addon_description(1) == 'summary'
+        await cf.close()
+
+
+@run
+async def test_given_session_is_left_open():
+    app, _ = make_app()
+    async with serve(app) as url, aiohttp.ClientSession() as session:
+        async with CurseForge(session, base_url=url) as cf:
+            assert cf.session is session
+            assert await cf.get_addon_description(1) == 'summary'
+        assert not session.closed
+
+
+@run
+async def test_pool_settings_are_applied():
+    timeout = aiohttp.ClientTimeout(total=5)
+    async with CurseForge(pool_size=7, pool_size_per_host=3, keepalive_timeout=5, dns_cache_ttl=60,
+                          timeout=timeout) as cf:
+        connector = cf.session.connector
+        assert (connector.limit, connector.limit_per_host) == (7, 3)
+        assert cf.session.timeout is timeout
+
+
+@run
+async def test_compression_can_be_turned_off():
+    app, encodings = make_app()
+    async with serve(app) as url:
+        async with CurseForge(base_url=url) as cf:
+            await cf.get_addon_description(1)
+        async with CurseForge(compress=False, base_url=url) as cf:
+            await cf.get_addon_description(1)
+    assert 'gzip' in encodings[0]
+    assert encodings[1] == 'identity'
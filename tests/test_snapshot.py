@@ -0,0 +1,144 @@
+import json
+import time
+
+import pytest
+from aiohttp import web
+
+from benchmarks.server import load_fixture
+from cache import MemoryCache
+from curseforge import CurseForge
+from objects import Addon, ModLoaderDetails
+from snapshot import MAGIC, SnapshotError, dump_snapshot, load_snapshot
+from tests.helpers import run, serve
+
+
+def make_app():
+    calls = []
+
+    async def game(request):
+        calls.append(request.path)
+        return web.json_response({'id': 432, 'name': 'Minecraft'}, headers={'ETag': '"g"'})
+
+    async def description(request):
+        calls.append(request.path)
+        return web.Response(text='summary')
+
+    app = web.Application()
+    app.router.add_get('/game/{game_id}', game)
+    app.router.add_get('/addon/{addon_id}/description', description)
+    return app, calls
+
+
+def write(path, data: bytes):
+    with open(path, 'wb') as f:
+        f.write(MAGIC + data)
+
+
+def read(path) -> list:
+    # The saved (time, models, entries) tuple, still in its tagged form
+    with open(path, 'rb') as f:
+        f.read(len(MAGIC))
+        return json.loads(f.read())[1]
+
+
+def test_models_round_trip_lazily(tmp_path):
+    path = str(tmp_path / 'worker.snap')
+    addon = Addon(load_fixture('addon'))
+    details = ModLoaderDetails(load_fixture('modloader_details'), serialise_date=False)
+    dump_snapshot(CurseForge(), path, {'addons': (addon,), 'forge': details})
+    cf = CurseForge()
+    models = load_snapshot(cf, path)
+    loaded = models['addons'][0]
+    assert loaded._lazy and loaded._cf is cf
+    # Nothing was decoded on the way in
+    with pytest.raises(AttributeError):
+        Addon.modified_at.__get__(loaded)
+    assert loaded.to_json() == addon.to_json()
+    assert loaded.modified_at == addon.modified_at
+    # JSON string fields are parsed on first access too
+    assert models['forge'].version == details.version
+    assert isinstance(models['forge'].modified_at, str)
+
+
+@run
+async def test_cache_is_restored(tmp_path):
+    path = str(tmp_path / 'worker.snap')
+    app, calls = make_app()
+    async with serve(app) as url:
+        async with CurseForge(cache=MemoryCache(), base_url=url) as cf:
+            await cf.get_game(432)
+            await cf.get_addon_description(1)
+            dump_snapshot(cf, path)
+        async with CurseForge(cache=MemoryCache(), base_url=url) as cf:
+            load_snapshot(cf, path)
+            assert (await cf.get_game(432)).name == 'Minecraft'
+            assert await cf.get_addon_description(1) == 'summary'
+    assert calls == ['/game/432', '/addon/1/description']
+
+
+@run
+async def test_entries_age_while_on_disk(tmp_path):
+    path = str(tmp_path / 'worker.snap')
+    app, calls = make_app()
+    async with serve(app) as url:
+        async with CurseForge(cache=MemoryCache(), ttls={'game': 60, 'addon': 60}, base_url=url) as cf:
+            await cf.get_game(432)
+            await cf.get_addon_description(1)
+            dump_snapshot(cf, path)
+        saved_at, models, entries = read(path)
+        # Pretend the snapshot sat on disk for two minutes
+        write(path, json.dumps(['t', [saved_at - 120, models, entries]]).encode())
+        async with CurseForge(cache=MemoryCache(), base_url=url) as cf:
+            load_snapshot(cf, path)
+            # The game entry can still be revalidated through its ETag, the description had nothing to check with
+            assert [key[1] for key, _ in cf.cache.items()] == ['game/432']
+            assert not cf.cache.get(('GET', 'game/432', None, True)).fresh
+
+
+def test_restore_cache_can_be_skipped(tmp_path):
+    path = str(tmp_path / 'worker.snap')
+    cf = CurseForge(cache=MemoryCache())
+    cf.cache.set(('GET', 'game/432', None, True), 'value', 60)
+    dump_snapshot(cf, path, include_cache=True)
+    fresh = CurseForge(cache=MemoryCache())
+    load_snapshot(fresh, path, restore_cache=False)
+    assert len(fresh.cache) == 0
+    load_snapshot(fresh, path)
+    assert fresh.cache.get(('GET', 'game/432', None, True)).value == 'value'
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / 'old.snap'
+    path.write_bytes(b'PCFSNAP\x01' + b'pickled')
+    with pytest.raises(SnapshotError):
+        load_snapshot(CurseForge(), str(path))
+
+
+@pytest.mark.parametrize('data', [
+    b'not json',
+    b'["t", [1, null]]',
+    b'{"a": 1}',
+    b'[]',
+    b'["t", [1, ["t"], []]]',
+    b'["t", [1, ["m", "Addon"], []]]',
+    b'["t", [1, ["m", "Addon", [1], true, false], []]]',
+    b'["t", [1, ["m", "Popen", {}, true, false], []]]',
+    b'["t", [1, ["x", []], []]]',
+    b'["t", [1, ["d", [[1]]], []]]',
+    b'["t", ["now", null, []]]',
+    b'["t", [1, null, ["l", [["l", [["l", [1]], 1, 60, null, null]]]]]]',
+    b'["t", [1, null, ["l", [["l", [1, 2]]]]]]',
+    b'["t", [1, null, 5]]',
+    b'[' * 100000,
+])
+def test_malformed_files_raise_snapshot_error(tmp_path, data):
+    path = str(tmp_path / 'bad.snap')
+    write(path, data)
+    with pytest.raises(SnapshotError):
+        load_snapshot(CurseForge(cache=MemoryCache()), path)
+
+
+def test_saved_at_is_the_wall_clock(tmp_path):
+    path = str(tmp_path / 'worker.snap')
+    dump_snapshot(CurseForge(), path)
+    assert abs(read(path)[0] - time.time()) < 5
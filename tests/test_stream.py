@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from benchmarks import server
+from curseforge import CurseForge, _iter_json_array
+from tests.helpers import run, serve
+
+ITEMS = [
+    {'id': 1, 'name': 'Just Enough Items', 'score': -12.5e3, 'tags': ['a', 'b'], 'ok': True, 'none': None},
+    {'id': 22, 'name': 'café \U0001f3ae', 'escaped': 'quote " slash \\ tab \t ]', 'nested': [[1, 2], {'x': [3]}]},
+    1234567,
+    -0.25,
+    'a string, with a comma ] and a bracket',
+    [],
+    {},
+    None,
+    False,
+]
+PAYLOAD = json.dumps(ITEMS, ensure_ascii=False, indent=1).encode()
+
+
+class Chunks:
+    # Stands in for aiohttp's StreamReader, cutting the body at fixed offsets
+    def __init__(self, data: bytes, size: int):
+        self.data = data
+        self.size = size
+
+    async def iter_chunked(self, n: int):
+        for i in range(0, len(self.data), self.size):
+            yield self.data[i:i + self.size]
+
+
+async def collect(data: bytes, size: int) -> list:
+    return [e async for e in _iter_json_array(Chunks(data, size))]
+
+
+@run
+async def test_every_chunk_boundary():
+    # Chunks of one or a few bytes split numbers, escapes and multi-byte UTF-8 sequences
+    for size in range(1, 40):
+        assert await collect(PAYLOAD, size) == ITEMS, size
+    assert await collect(PAYLOAD, len(PAYLOAD)) == ITEMS
+
+
+@run
+async def test_empty_array():
+    assert await collect(b' [ ] ', 1) == []
+
+
+@run
+async def test_truncated_array():
+    end = PAYLOAD.rindex(b']')
+    for cut in range(1, end):
+        with pytest.raises(ValueError):
+            await collect(PAYLOAD[:cut], 7)
+
+
+@pytest.mark.parametrize('body', [b'', b'   ', b'{"id": 1}'])
+@run
+async def test_not_an_array(body):
+    with pytest.raises(ValueError, match='Expected a JSON array'):
+        await collect(body, 4)
+
+
+def files_app(body: bytes, piece: int = 997):
+    async def handler(request):
+        response = web.StreamResponse(headers={'Content-Type': 'application/json'})
+        await response.prepare(request)
+        for i in range(0, len(body), piece):
+            await response.write(body[i:i + piece])
+            await asyncio.sleep(0)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get('/addon/{addon_id}/files', handler)
+    return app
+
+
+@run
+async def test_stream_addon_files_over_the_network():
+    # The response is flushed in small pieces, so items arrive split across reads
+    files = server.load_fixture('files')
+    async with serve(files_app(json.dumps(files).encode())) as url, CurseForge(base_url=url) as cf:
+        streamed = [f async for f in cf.stream_addon_files(1)]
+    assert [f.id for f in streamed] == [f['id'] for f in files]
+    assert streamed[0].file_name == files[0]['fileName']
+
+
+@run
+async def test_pluggable_decoder():
+    decoded = []
+
+    def loads(body):
+        decoded.append(len(body))
+        return json.loads(body)
+
+    files = server.load_fixture('files')
+    body = json.dumps(files).encode()
+    async with serve(files_app(body)) as url, CurseForge(json_loads=loads, base_url=url) as cf:
+        assert len(await cf.get_addon_files(1)) == len(files)
+    assert decoded == [len(body)]
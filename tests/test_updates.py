@@ -0,0 +1,97 @@
+import pytest
+from aiohttp import web
+
+from curseforge import AddonBatchError, CurseForge, CurseForgeException
+from objects import ModLoaderType
+from tests.helpers import run, serve
+from updates import UpdateChecker
+
+
+def addon(addon_id: int, game_version_files=(), latest_files=()) -> dict:
+    return {'id': addon_id,
+            'gameVersionLatestFiles': [{'gameVersion': v, 'modLoader': loader, 'projectFileId': file_id,
+                                        'projectFileName': f'{file_id}.jar', 'fileType': 1}
+                                       for v, loader, file_id in game_version_files],
+            'latestFiles': [{'id': file_id, 'fileName': f'{file_id}.jar', 'gameVersion': list(versions),
+                             'releaseType': 1} for file_id, versions in latest_files]}
+
+
+def make_app(addons: dict, files: dict = None, failing=()):
+    listed = []
+    batches = []
+
+    async def get_addons(request):
+        ids = await request.json()
+        batches.append(ids)
+        if set(ids) & set(failing):
+            return web.Response(status=400)
+        return web.json_response([addons[i] for i in ids if i in addons])
+
+    async def get_files(request):
+        addon_id = int(request.match_info['addon_id'])
+        listed.append(addon_id)
+        return web.json_response([{'id': file_id, 'fileName': f'{file_id}.jar', 'gameVersion': list(versions),
+                                   'releaseType': 1} for file_id, versions in (files or {}).get(addon_id, ())])
+
+    app = web.Application()
+    app.router.add_post('/addon', get_addons)
+    app.router.add_get('/addon/{addon_id}/files', get_files)
+    return app, listed, batches
+
+
+@run
+async def test_failed_chunk_keeps_the_others():
+    app, _, batches = make_app({i: addon(i) for i in range(6)}, failing=(3,))
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        with pytest.raises(AddonBatchError) as e:
+            await cf.get_addons(range(6), chunk_size=2)
+        assert sorted(a.id for a in e.value.partial) == [0, 1, 4, 5]
+        assert e.value.failed == [2, 3]
+        assert len(e.value.errors) == 1
+        errors = []
+        cf.error(errors.append)
+        assert sorted(a.id for a in await cf.get_addons(range(6), chunk_size=2)) == [0, 1, 4, 5]
+    # The handler sees the chunk's own error, then the batch error with what did arrive
+    assert [type(e) for e in errors] == [CurseForgeException, AddonBatchError]
+    assert errors[1].failed == [2, 3] and errors[1].errors == []
+    assert len(batches) == 6
+
+
+@run
+async def test_loader_by_type_or_name():
+    app, listed, _ = make_app({1: addon(1, [('1.16.5', ModLoaderType.FORGE, 11), ('1.16.5', ModLoaderType.FABRIC, 12)])})
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        checker = UpdateChecker(cf)
+        for loader in (ModLoaderType.FORGE, int(ModLoaderType.FORGE), 'Forge', 'forge'):
+            updates = await checker.check([(1, 10, '1.16.5', loader)])
+            assert [(u.file_id, u.file_name) for u in updates] == [(11, '11.jar')], loader
+        updates = await checker.check([(1, 10, '1.16.5', 'Fabric'), (1, 10, '1.16.5', None)])
+        assert [u.file_id for u in updates] == [12, 12]
+    assert listed == []
+
+
+@run
+async def test_unknown_loader_name_falls_back_to_file_versions():
+    app, _, _ = make_app({1: addon(1, [('1.16.5', ModLoaderType.FORGE, 11)], [(13, ('1.16.5', 'Quilt'))])})
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        updates = await UpdateChecker(cf).check([(1, 10, '1.16.5', 'Quilt')])
+    assert [u.file_id for u in updates] == [13]
+    assert updates[0].file.file_name == '13.jar'
+
+
+@run
+async def test_listing_is_only_fetched_when_bulk_data_has_nothing():
+    app, listed, _ = make_app({1: addon(1, [('1.16.5', ModLoaderType.FORGE, 11)]), 2: addon(2)},
+                              {2: [(20, ('1.12.2', 'Forge')), (21, ('1.12.2', 'Forge'))]})
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        updates = await UpdateChecker(cf).check([(1, 11, '1.16.5', 'Forge'), (2, 1, '1.12.2', 'Forge')])
+    assert [(u.addon.id, u.installed_file_id, u.file_id) for u in updates] == [(2, 1, 21)]
+    assert listed == [2]
+
+
+@run
+async def test_installs_share_one_bulk_request():
+    app, _, batches = make_app({i: addon(i) for i in range(3)})
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        await UpdateChecker(cf).check([(i, 0, '1.16.5', None) for i in (0, 1, 2, 1)])
+    assert [sorted(b) for b in batches] == [[0, 1, 2]]
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from curseforge import CurseForge, CurseForgeException
+from tests.helpers import run, serve
+from watch import AddonWatcher
+
+
+def make_app(failing=()):
+    state = {'modified': '2021-01-01T00:00:00Z', 'files': [1]}
+
+    async def get_addons(request):
+        ids = await request.json()
+        if set(ids) & set(failing):
+            return web.Response(status=400)
+        return web.json_response([{'id': i, 'dateModified': state['modified'],
+                                   'latestFiles': [{'id': f} for f in state['files']]} for i in ids])
+
+    app = web.Application()
+    app.router.add_post('/addon', get_addons)
+    return app, state
+
+
+@run
+async def test_failed_chunk_backs_off_only_its_ids():
+    failing = set()
+    app, state = make_app(failing)
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        watcher = AddonWatcher(cf, range(4), min_interval=10, max_interval=100, chunk_size=2, max_failures=1)
+        await watcher.poll()
+        failing.add(3)
+        state['files'] = [1, 2]
+        changes = await watcher.poll()
+    assert sorted(c.addon.id for c in changes) == [0, 1]
+    assert [watcher.interval(i) for i in range(4)] == [10, 10, 20, 20]
+    assert watcher.failures == 0
+    assert watcher.last_error.failed == [2, 3]
+
+
+@run
+async def test_first_poll_only_records_state():
+    app, _ = make_app()
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        watcher = AddonWatcher(cf, [1, 2])
+        assert await watcher.poll() == []
+        assert await watcher.poll() == []
+
+
+@run
+async def test_changes_are_reported():
+    app, state = make_app()
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        watcher = AddonWatcher(cf, [1])
+        await watcher.poll()
+        state['files'] = [1, 2]
+        change, = await watcher.poll()
+        assert (change.addon.id, change.modified, change.files_changed) == (1, False, True)
+        assert [f.id for f in change.new_files] == [2]
+        state['modified'] = '2021-01-02T00:00:00Z'
+        change, = await watcher.poll()
+        assert (change.modified, change.files_changed, change.new_files) == (True, False, ())
+
+
+@run
+async def test_intervals_adapt():
+    app, state = make_app()
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        watcher = AddonWatcher(cf, [1], min_interval=10, max_interval=30)
+        await watcher.poll()
+        assert watcher.interval(1) == 10
+        await watcher.poll()
+        assert watcher.interval(1) == 15
+        await watcher.poll()
+        await watcher.poll()
+        assert watcher.interval(1) == 30
+        state['files'] = [1, 2]
+        await watcher.poll()
+        assert watcher.interval(1) == 15
+        # Freshly polled addons aren't due until their interval has passed
+        assert watcher.due() == []
+
+
+@run
+async def test_repeated_outage_is_raised():
+    failing = {1}
+    app, _ = make_app(failing)
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        watcher = AddonWatcher(cf, [1], min_interval=10, max_interval=100, max_failures=3)
+        assert await watcher.poll() == []
+        assert await watcher.poll() == []
+        assert watcher.failures == 2
+        assert watcher.interval(1) == 40
+        with pytest.raises(CurseForgeException):
+            await watcher.poll()
+        failing.clear()
+        await watcher.poll()
+        assert watcher.failures == 0
+
+
+@run
+async def test_unlimited_failures():
+    app, _ = make_app({1})
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        watcher = AddonWatcher(cf, [1], max_failures=None)
+        for _ in range(10):
+            assert await watcher.poll() == []
+    assert isinstance(watcher.last_error, CurseForgeException)
+
+
+def test_add_and_remove():
+    watcher = AddonWatcher(CurseForge(), [1, 2, 3], min_interval=5)
+    watcher.add([3, 4])
+    assert len(watcher) == 4
+    watcher.remove([1, 9])
+    assert len(watcher) == 3
+    assert 1 not in watcher and 4 in watcher
+    # The last row moved into the gap keeps its own state
+    assert watcher.interval(4) == 5
+    assert sorted(watcher.due()) == [2, 3, 4]
+    watcher.remove([2, 3, 4])
+    assert len(watcher) == 0 and watcher.due() == []
+
+
+@run
+async def test_watch_yields_changes():
+    app, state = make_app()
+    async with serve(app) as url, CurseForge(base_url=url) as cf:
+        watcher = AddonWatcher(cf, [1], min_interval=0.01, max_interval=0.01, tick=0.005)
+        changes = watcher.watch()
+        await watcher.poll()
+        state['files'] = [1, 2]
+        change = await asyncio.wait_for(changes.__anext__(), 1)
+        await changes.aclose()
+    assert [f.id for f in change.new_files] == [2]
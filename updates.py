@@ -0,0 +1,82 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from curseforge import CurseForge
+from objects import Addon, AddonFile, ModLoaderType, ReleaseType
+
+Install = Tuple[int, int, str, Union[str, ModLoaderType, None]]
+Loader = Tuple[Optional[ModLoaderType], Optional[str]]
+
+# Files name their loader among the game versions, e.g. 'Forge' or 'LiteLoader'
+_LOADER_TYPES = {t.name.title().replace('_', '').lower(): t for t in ModLoaderType}
+
+
+def _loader(loader: Union[str, ModLoaderType, None]) -> Loader:
+    # Bulk payloads give the loader as a ModLoaderType and file listings by name, so both forms are kept
+    if not loader:
+        return None, None
+    if isinstance(loader, str):
+        return _LOADER_TYPES.get(loader.lower()), loader
+    loader = ModLoaderType(loader)
+    return loader, loader.name.title().replace('_', '')
+
+
+class Update:
+    __slots__ = ('addon', 'installed_file_id', 'file_id', 'file_name', 'file')
+
+    def __init__(self, addon: Addon, installed_file_id: int, file_id: int, file_name: str,
+                 file: Optional[AddonFile]):
+        self.addon = addon
+        self.installed_file_id = installed_file_id
+        self.file_id = file_id
+        self.file_name = file_name
+        self.file = file
+
+
+class UpdateChecker:
+
+    def __init__(self, cf: CurseForge, release_type: ReleaseType = ReleaseType.RELEASE, chunk_size: int = 500):
+        self._cf = cf
+        self.release_type = release_type
+        self.chunk_size = chunk_size
+
+    def __from_addon(self, addon: Addon, game_version: str,
+                     loader: Loader) -> Optional[Tuple[int, str, Optional[AddonFile]]]:
+        loader_type, loader_name = loader
+        latest = {f.id: f for f in addon.latest_files}
+        # A loader name with no ModLoaderType can't match these entries, only the file listings below
+        candidates = [(f.file_id, f.file_name) for f in addon.game_version_latest_files
+                      if f.version == game_version and f.file_type <= self.release_type
+                      and (not loader_name or loader_type is not None and f.mod_loader == loader_type)]
+        if not candidates:
+            candidates = [(f.id, f.file_name) for f in latest.values()
+                          if f.compatible(game_version, loader_name, self.release_type)]
+        if not candidates:
+            return None
+        file_id, file_name = max(candidates)
+        return file_id, file_name, latest.get(file_id)
+
+    async def __from_listing(self, addon: Addon, game_version: str,
+                             loader: Loader) -> Optional[Tuple[int, str, Optional[AddonFile]]]:
+        files = [f for f in await self._cf.get_addon_files(addon.id) or ()
+                 if f.compatible(game_version, loader[1], self.release_type)]
+        if not files:
+            return None
+        file = max(files, key=lambda f: f.id)
+        return file.id, file.file_name, file
+
+    async def check(self, installs: Iterable[Install]) -> List[Update]:
+        installs = list(installs)
+        ids = list(dict.fromkeys(int(i[0]) for i in installs))
+        addons: Dict[int, Addon] = {a.id: a for a in await self._cf.get_addons(ids, chunk_size=self.chunk_size) or ()}
+        known = [(i, addons[int(i[0])]) for i in installs if int(i[0]) in addons]
+        loaders = [_loader(install[3]) for install, _ in known]
+        latest = [self.__from_addon(addon, install[2], loader) for (install, addon), loader in zip(known, loaders)]
+        # Only addons whose bulk payload says nothing about the requested version need their full file listing
+        missing = [n for n, found in enumerate(latest) if found is None]
+        listed = await asyncio.gather(*(self.__from_listing(known[n][1], known[n][0][2], loaders[n])
+                                        for n in missing))
+        for n, found in zip(missing, listed):
+            latest[n] = found
+        return [Update(addon, install[1], found[0], found[1], found[2])
+                for (install, addon), found in zip(known, latest) if found is not None and found[0] > install[1]]
@@ -0,0 +1,155 @@
+import asyncio
+import time
+from array import array
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from curseforge import AddonBatchError, CurseForge
+from objects import Addon, AddonFile
+
+
+class AddonChange:
+    __slots__ = ('addon', 'modified', 'files_changed', 'new_files')
+
+    def __init__(self, addon: Addon, modified: bool, files_changed: bool, new_files: Tuple[AddonFile, ...]):
+        self.addon = addon
+        self.modified = modified
+        self.files_changed = files_changed
+        self.new_files = new_files
+
+
+class AddonWatcher:
+
+    def __init__(self, cf: CurseForge, addon_ids: Iterable[int] = (), min_interval: float = 60,
+                 max_interval: float = 3600, tick: float = 5, chunk_size: int = 500, serialise_date: bool = True,
+                 max_failures: Optional[int] = 5):
+        self._cf = cf
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.tick = tick
+        self.chunk_size = chunk_size
+        self.serialise_date = serialise_date
+        self.max_failures = max_failures
+        self.failures = 0
+        self.last_error: Optional[BaseException] = None
+        # One row per addon across flat arrays, about 48 bytes each plus the index entry
+        self.__index: Dict[int, int] = {}
+        self.__ids = array('q')
+        self.__modified = array('q')  # hash of modified_at
+        self.__files = array('q')  # hash of the latest file ids
+        self.__newest = array('q')  # highest latest file id, -1 until the first poll
+        self.__interval = array('d')
+        self.__due = array('d')
+        self.add(addon_ids)
+
+    def __len__(self):
+        return len(self.__ids)
+
+    def __contains__(self, addon_id: int):
+        return addon_id in self.__index
+
+    def add(self, addon_ids: Iterable[int]):
+        now = time.monotonic()
+        for addon_id in map(int, addon_ids):
+            if addon_id in self.__index:
+                continue
+            self.__index[addon_id] = len(self.__ids)
+            self.__ids.append(addon_id)
+            self.__modified.append(0)
+            self.__files.append(0)
+            self.__newest.append(-1)
+            self.__interval.append(self.min_interval)
+            self.__due.append(now)
+
+    def remove(self, addon_ids: Iterable[int]):
+        columns = (self.__ids, self.__modified, self.__files, self.__newest, self.__interval, self.__due)
+        for addon_id in map(int, addon_ids):
+            i = self.__index.pop(addon_id, None)
+            if i is None:
+                continue
+            # Move the last row into the gap so the arrays stay dense
+            last = len(self.__ids) - 1
+            if i != last:
+                for column in columns:
+                    column[i] = column[last]
+                self.__index[self.__ids[i]] = i
+            for column in columns:
+                column.pop()
+
+    def interval(self, addon_id: int) -> float:
+        return self.__interval[self.__index[addon_id]]
+
+    def __update(self, i: int, addon: Addon, now: float) -> Optional[AddonChange]:
+        files = addon.latest_files or ()
+        ids = tuple(sorted(f.id for f in files))
+        modified = hash(addon.modified_at)
+        files_hash = hash(ids)
+        newest = self.__newest[i]
+        changed = newest >= 0 and (modified != self.__modified[i] or files_hash != self.__files[i])
+        if newest >= 0:
+            # Addons that change often are polled more often, quiet ones back off towards max_interval
+            interval = self.__interval[i] / 2 if changed else self.__interval[i] * 1.5
+            self.__interval[i] = min(max(interval, self.min_interval), self.max_interval)
+        self.__due[i] = now + self.__interval[i]
+        change = None
+        if changed:
+            change = AddonChange(addon, modified != self.__modified[i], files_hash != self.__files[i],
+                                 tuple(f for f in files if f.id > newest))
+        self.__modified[i] = modified
+        self.__files[i] = files_hash
+        self.__newest[i] = max(newest, ids[-1] if ids else 0)
+        return change
+
+    async def poll(self, addon_ids: Iterable[int] = None) -> List[AddonChange]:
+        ids = list(self.__index) if addon_ids is None else [i for i in map(int, addon_ids) if i in self.__index]
+        failed = ()
+        try:
+            addons = await self._cf.get_addons(ids, self.serialise_date, self.chunk_size)
+        except AddonBatchError as e:
+            # The chunks that answered are still used, only the ids of the failed ones back off
+            addons, failed, self.last_error = e.partial, e.failed, e
+        except Exception as e:
+            addons, failed, self.last_error = (), ids, e
+        now = time.monotonic()
+        if failed:
+            # The failed ids back off like quiet addons do, so an outage isn't hammered every tick
+            for addon_id in failed:
+                i = self.__index.get(addon_id)
+                if i is not None:
+                    self.__interval[i] = min(max(self.__interval[i] * 2, self.min_interval), self.max_interval)
+                    self.__due[i] = now + self.__interval[i]
+        if failed and len(failed) >= len(ids):
+            # Only a poll nothing answered counts towards max_failures
+            self.failures += 1
+            if self.max_failures is not None and self.failures >= self.max_failures:
+                raise self.last_error
+            return []
+        self.failures = 0
+        changes = []
+        for addon in addons or ():
+            i = self.__index.get(addon.id)
+            if i is not None:
+                change = self.__update(i, addon, now)
+                if change is not None:
+                    changes.append(change)
+        # Addons missing from the response wait a full interval like unchanged ones
+        for addon_id in ids:
+            i = self.__index.get(addon_id)
+            if i is not None and self.__due[i] <= now:
+                self.__due[i] = now + self.__interval[i]
+        return changes
+
+    def due(self, now: float = None) -> List[int]:
+        horizon = (time.monotonic() if now is None else now) + self.tick
+        return [addon_id for addon_id, due in zip(self.__ids, self.__due) if due <= horizon]
+
+    async def watch(self) -> AsyncIterator[AddonChange]:
+        while True:
+            ids = self.due()
+            if ids:
+                for change in await self.poll(ids):
+                    yield change
+            wait = min(self.__due, default=time.monotonic() + self.max_interval) - time.monotonic()
+            await asyncio.sleep(max(wait, self.tick))
+
+    def __aiter__(self) -> AsyncIterator[AddonChange]:
+        return self.watch()